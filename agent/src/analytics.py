@@ -0,0 +1,181 @@
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Remediation outcome analytics.
+# Every finished graph run becomes one row in a local DuckDB (columnar) file;
+# /stats answers MTTR, success rates and latency percentiles with SQL.
+# ============================================================================
+
+NODES = ["analyst", "auditor", "decision", "remediation", "verification"]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS outcomes (
+    correlation_id VARCHAR,
+    recorded_at TIMESTAMPTZ,
+    alert_started_at TIMESTAMPTZ,
+    alert_name VARCHAR,
+    severity VARCHAR,
+    service VARCHAR,
+    action VARCHAR,
+    confidence DOUBLE,
+    remediation_result VARCHAR,
+    verification_result VARCHAR,
+    success BOOLEAN,
+    mttr_seconds DOUBLE,
+    duration_ms DOUBLE,
+    {", ".join(f"{node}_ms DOUBLE" for node in NODES)}
+)
+"""
+
+# Columns added after the first release; older files are migrated in place
+MIGRATIONS = [
+    "ALTER TABLE outcomes ADD COLUMN IF NOT EXISTS remediation_result VARCHAR",
+    "ALTER TABLE outcomes ADD COLUMN IF NOT EXISTS verification_result VARCHAR",
+]
+
+COLUMNS = [
+    "correlation_id", "recorded_at", "alert_started_at", "alert_name", "severity", "service",
+    "action", "confidence", "remediation_result", "verification_result", "success",
+    "mttr_seconds", "duration_ms", *[f"{node}_ms" for node in NODES],
+]
+
+WINDOW_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+def parse_window(window: str) -> timedelta:
+    """Parses "15m", "24h", "7d" style windows."""
+    match = re.fullmatch(r"(\d+)([smhd])", window.strip())
+    if not match:
+        raise ValueError(f"Invalid window '{window}'. Use e.g. 30s, 15m, 24h, 7d.")
+    return timedelta(**{WINDOW_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def alert_started_at(alert: Dict[str, Any]) -> Optional[datetime]:
+    """Earliest startsAt across the Alertmanager payload's alerts, if present."""
+    details = alert.get("details") or {}
+    starts = [_parse_timestamp(a.get("startsAt")) for a in details.get("alerts", []) if isinstance(a, dict)]
+    starts = [s for s in starts if s and s.year > 1]  # Alertmanager uses 0001-01-01 for "unset"
+    return min(starts) if starts else None
+
+
+def remediation_result(result: Dict[str, Any]) -> str:
+    """What the remediation node itself reported (the final execution_result belongs to verification)."""
+    node_results = result.get("node_results") or {}
+    return node_results.get("remediation", result.get("execution_result")) or ""
+
+
+class OutcomeStore:
+    """Append-only store of remediation outcomes backed by a DuckDB file."""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = duckdb.connect(path)
+        self._conn.execute(SCHEMA)
+        for migration in MIGRATIONS:
+            self._conn.execute(migration)
+        self._lock = threading.Lock()
+
+    def record(self, result: Dict[str, Any], correlation_id: Optional[str] = None,
+               finished_at: Optional[datetime] = None):
+        """
+        Appends one finished graph run (the final AgentState). Success is
+        judged on the remediation node's own result; the verification result
+        is stored alongside it. MTTR is alert start (Alertmanager startsAt) to
+        remediation finished, not to confirmed recovery, and is NULL when the
+        alert has no startsAt (duration_ms still records processing time).
+        """
+        finished_at = finished_at or datetime.now(timezone.utc)
+        alert = result.get("alert") or {}
+        plan = result.get("plan") or {}
+        durations = result.get("node_durations") or {}
+        remediation = remediation_result(result)
+        started_at = alert_started_at(alert)
+
+        row = [
+            correlation_id, finished_at, started_at,
+            alert.get("alert_name"), alert.get("severity"), alert.get("service"),
+            plan.get("action", "unknown"), plan.get("confidence"),
+            remediation, (result.get("node_results") or {}).get("verification"),
+            remediation.startswith("Success"),
+            (finished_at - started_at).total_seconds() if started_at else None,
+            sum(durations.values()) if durations else None,
+            *[durations.get(node) for node in NODES],
+        ]
+        placeholders = ", ".join("?" * len(row))
+        with self._lock:
+            self._conn.execute(f"INSERT INTO outcomes ({', '.join(COLUMNS)}) VALUES ({placeholders})", row)
+
+    def _query(self, sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, values)) for values in cursor.fetchall()]
+
+    def stats(self, since: datetime, until: datetime, service: Optional[str] = None,
+              action: Optional[str] = None) -> Dict[str, Any]:
+        """Aggregates outcomes recorded in [since, until), optionally filtered by service/action."""
+        where = "recorded_at >= ? AND recorded_at < ?"
+        params: List[Any] = [since, until]
+        if service:
+            where += " AND service = ?"
+            params.append(service)
+        if action:
+            where += " AND action = ?"
+            params.append(action)
+
+        summary_columns = """
+            count(*) AS total,
+            avg(success::INTEGER) AS success_rate,
+            avg(mttr_seconds) FILTER (WHERE success) AS mttr_mean_seconds,
+            quantile_cont(mttr_seconds, 0.5) FILTER (WHERE success) AS mttr_p50_seconds,
+            quantile_cont(mttr_seconds, 0.95) FILTER (WHERE success) AS mttr_p95_seconds
+        """
+        overall = self._query(f"""
+            SELECT {summary_columns},
+                quantile_cont(duration_ms, 0.5) AS latency_p50_ms,
+                quantile_cont(duration_ms, 0.95) AS latency_p95_ms,
+                quantile_cont(duration_ms, 0.99) AS latency_p99_ms,
+                {", ".join(f"quantile_cont({node}_ms, 0.95) AS {node}_p95_ms" for node in NODES)}
+            FROM outcomes WHERE {where}
+        """, params)[0]
+        by_action = self._query(f"SELECT action, {summary_columns} FROM outcomes WHERE {where} GROUP BY action ORDER BY total DESC", params)
+        by_service = self._query(f"SELECT service, {summary_columns} FROM outcomes WHERE {where} GROUP BY service ORDER BY total DESC", params)
+
+        return {
+            "window": {"since": since.isoformat(), "until": until.isoformat()},
+            "total": overall["total"],
+            "success_rate": overall["success_rate"],
+            "mttr_seconds": {"mean": overall["mttr_mean_seconds"], "p50": overall["mttr_p50_seconds"], "p95": overall["mttr_p95_seconds"]},
+            "latency_ms": {
+                "p50": overall["latency_p50_ms"],
+                "p95": overall["latency_p95_ms"],
+                "p99": overall["latency_p99_ms"],
+                "node_p95": {node: overall[f"{node}_p95_ms"] for node in NODES},
+            },
+            "by_action": by_action,
+            "by_service": by_service,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
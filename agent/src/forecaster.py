@@ -0,0 +1,233 @@
+import logging
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+
+from src.tools.prometheus_query import query_range
+from src.tools.ecs_client import get_desired_count, update_desired_count
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Predictive pre-scaling.
+# Every interval, pull CPU and request-rate history from Prometheus, fit a
+# linear trend + Fourier seasonality per service (services with complete
+# history share one least-squares solve) and scale ahead of HighCPUUsage.
+#
+# The forecast is on *total* CPU per service, which doesn't change when the
+# task count does (a per-task average drops at every scale event and bends
+# the trend). HighCPUUsage fires per instance, so the target count is
+# inflated by the current hot-task imbalance (max / mean per task).
+# ============================================================================
+
+CPU_QUERY = "sum by (job) (rate(process_cpu_seconds_total[1m])) * 100"
+HOT_TASK_QUERY = "max by (job) (rate(process_cpu_seconds_total[1m])) * 100"
+TASK_COUNT_QUERY = "count by (job) (rate(process_cpu_seconds_total[1m]))"
+RPS_QUERY = "sum by (job) (rate(http_requests_total[1m]))"
+
+FORECAST_CPU = Gauge('agent_forecast_cpu_percent', 'Forecast peak total CPU percent (summed over tasks) over the horizon', ['service'])
+FORECAST_ERROR = Gauge('agent_forecast_abs_error_percent', 'Absolute error of the previous CPU forecast (percentage points)', ['service'])
+PRESCALE_ACTIONS = Counter('agent_prescale_actions_total', 'Predictive scale-up actions issued', ['service'])
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def parse_service_map(value: str) -> Dict[str, str]:
+    """Parses "job=ecs-service,job2=ecs-service2" into {job: ecs_service}."""
+    mapping = {}
+    for pair in filter(None, (p.strip() for p in value.split(","))):
+        job, _, service = pair.partition("=")
+        mapping[job.strip()] = (service or job).strip()
+    return mapping
+
+
+def design_matrix(t: np.ndarray, season_steps: Optional[int]) -> np.ndarray:
+    columns = [np.ones_like(t), t]
+    if season_steps:
+        angle = 2 * np.pi * t / season_steps
+        columns += [np.sin(angle), np.cos(angle)]
+    return np.column_stack(columns)
+
+
+def fit_forecast(y: np.ndarray, horizon_steps: int, season_steps: Optional[int] = None) -> np.ndarray:
+    """
+    Fits trend (+ seasonality when the history covers a full season) to every
+    column of `y` (time x series) and returns the next `horizon_steps` values
+    (horizon x series), clamped at zero. Complete series share one lstsq
+    solve; series with missing samples are fitted on their observed points
+    only. Series with fewer than 3 samples forecast NaN.
+    """
+    steps = y.shape[0]
+    if season_steps and steps < season_steps:
+        season_steps = None
+    t = np.arange(steps, dtype=float)
+    X = design_matrix(t, season_steps)
+    X_future = design_matrix(np.arange(steps, steps + horizon_steps, dtype=float), season_steps)
+
+    forecast = np.full((horizon_steps, y.shape[1]), np.nan)
+    observed = ~np.isnan(y)
+    complete = observed.all(axis=0)
+    if complete.any():
+        coef, *_ = np.linalg.lstsq(X, y[:, complete], rcond=None)
+        forecast[:, complete] = X_future @ coef
+    for col in np.flatnonzero(~complete):
+        rows = observed[:, col]
+        if rows.sum() >= 3:
+            coef, *_ = np.linalg.lstsq(X[rows], y[rows, col], rcond=None)
+            forecast[:, col] = X_future @ coef
+    return np.maximum(forecast, 0.0)
+
+
+def compute_target_count(current_count: int, peak_total_cpu_percent: float, target_cpu_percent: float, max_count: int) -> int:
+    """Tasks needed to keep per-task CPU at the target if the forecast peak total load arrives. Never scales down."""
+    needed = math.ceil(peak_total_cpu_percent / target_cpu_percent)
+    return max(current_count, min(max_count, needed))
+
+
+def hot_task_imbalance(total_cpu: float, hot_task_cpu: float, task_count: float) -> float:
+    """How far the busiest task runs above the per-task mean (>= 1; 1 when unknown)."""
+    if not (total_cpu > 0 and task_count > 0) or np.isnan(hot_task_cpu):
+        return 1.0
+    return max(1.0, hot_task_cpu / (total_cpu / task_count))
+
+
+class Forecaster:
+    """Background thread that pre-scales ECS services from Prometheus trends."""
+
+    def __init__(self, services: Optional[Dict[str, str]] = None, clock: Callable[[], float] = time.time):
+        self.services = services or parse_service_map(
+            os.getenv("FORECAST_SERVICES", f"frontend={os.getenv('ECS_SERVICE', 'frontend-app-dev')}"))
+        self.cluster = os.getenv("ECS_CLUSTER", "devsecops-cluster-dev")
+        self.interval = _env_int("FORECAST_INTERVAL_SECONDS", 60)
+        self.step = _env_int("FORECAST_STEP_SECONDS", 60)
+        self.lookback_steps = _env_int("FORECAST_LOOKBACK_MINUTES", 180) * 60 // self.step
+        self.horizon_steps = max(1, _env_int("FORECAST_HORIZON_MINUTES", 10) * 60 // self.step)
+        self.season_steps = _env_int("FORECAST_SEASON_MINUTES", 60) * 60 // self.step or None
+        self.min_points = _env_int("FORECAST_MIN_POINTS", 15)
+        self.target_cpu = float(os.getenv("FORECAST_TARGET_CPU_PERCENT", "60"))
+        self.max_tasks = _env_int("FORECAST_MAX_TASKS", 10)
+        self.cooldown = _env_int("FORECAST_COOLDOWN_SECONDS", 300)
+        self._clock = clock
+        self._predictions: Dict[str, Dict[float, float]] = {}
+        self._last_scaled: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _to_matrix(self, series: List[Dict], start: float) -> np.ndarray:
+        """Aligns query_range results onto a (time x job) grid; missing samples are NaN."""
+        jobs = list(self.services)
+        y = np.full((self.lookback_steps + 1, len(jobs)), np.nan)
+        for s in series:
+            job = s["metric"].get("job")
+            if job not in self.services or not s["values"]:
+                continue
+            ts, values = np.array(s["values"]).T
+            index = np.round((ts - start) / self.step).astype(int)
+            keep = (index >= 0) & (index < y.shape[0])
+            y[index[keep], jobs.index(job)] = values[keep]
+        return y
+
+    @staticmethod
+    def _latest(y: np.ndarray, col: int) -> float:
+        values = y[~np.isnan(y[:, col]), col]
+        return float(values[-1]) if len(values) else float("nan")
+
+    def _track_error(self, job: str, at: float, actual: float):
+        predictions = self._predictions.get(job, {})
+        predicted = predictions.pop(at, None)
+        if predicted is not None and not np.isnan(predicted) and not np.isnan(actual):
+            FORECAST_ERROR.labels(service=job).set(abs(predicted - actual))
+        for ts in [ts for ts in predictions if ts <= at]:
+            del predictions[ts]
+
+    def run_once(self) -> Dict[str, int]:
+        """One forecast cycle. Returns {job: target_count} for services that were scaled."""
+        end = math.floor(self._clock() / self.step) * self.step
+        start = end - self.lookback_steps * self.step
+        cpu = self._to_matrix(query_range(CPU_QUERY, start, end, self.step), start)
+        hot = self._to_matrix(query_range(HOT_TASK_QUERY, start, end, self.step), start)
+        tasks = self._to_matrix(query_range(TASK_COUNT_QUERY, start, end, self.step), start)
+        rps = self._to_matrix(query_range(RPS_QUERY, start, end, self.step), start)
+
+        cpu_forecast = fit_forecast(cpu, self.horizon_steps, self.season_steps)
+        rps_forecast = fit_forecast(rps, self.horizon_steps, self.season_steps)
+        future = end + self.step * np.arange(1, self.horizon_steps + 1)
+
+        scaled = {}
+        for i, job in enumerate(self.services):
+            valid = ~np.isnan(cpu[:, i])
+            if valid.sum() < self.min_points:
+                logger.debug("Forecaster: not enough CPU history for %s", job)
+                continue
+
+            self._track_error(job, end, cpu[-1, i])
+            self._predictions[job] = dict(zip(future.tolist(), cpu_forecast[:, i].tolist()))
+
+            cpu_now = cpu[valid, i][-1]
+            peak = float(cpu_forecast[:, i].max())
+            # Request growth leads CPU: scale current CPU by the forecast traffic ratio
+            rps_valid = rps[~np.isnan(rps[:, i]), i]
+            if len(rps_valid) >= self.min_points and rps_valid[-1] > 0:
+                peak = max(peak, float(cpu_now * rps_forecast[:, i].max() / rps_valid[-1]))
+            FORECAST_CPU.labels(service=job).set(peak)
+
+            task_count = self._latest(tasks, i)
+            imbalance = hot_task_imbalance(cpu_now, self._latest(hot, i), task_count)
+            target = self._maybe_scale(job, peak, imbalance, task_count)
+            if target:
+                scaled[job] = target
+        return scaled
+
+    def _maybe_scale(self, job: str, peak: float, imbalance: float = 1.0,
+                     task_count: float = float("nan")) -> Optional[int]:
+        """`peak` is forecast total CPU; `imbalance` scales it to what the hottest task would see."""
+        load = peak * imbalance
+        # Skip the ECS lookup when the running tasks already absorb the forecast load
+        if load <= self.target_cpu or (task_count > 0 and load / task_count <= self.target_cpu):
+            return None
+        now = self._clock()
+        if now - self._last_scaled.get(job, float("-inf")) < self.cooldown:
+            return None
+
+        service = self.services[job]
+        current = get_desired_count(self.cluster, service)
+        if not current:
+            return None
+        target = compute_target_count(current, load, self.target_cpu, self.max_tasks)
+        if target <= current:
+            return None
+
+        logger.info("Forecaster: pre-scaling %s from %d to %d tasks (forecast peak total CPU %.1f%%, hot-task imbalance %.2f)",
+                    service, current, target, peak, imbalance, extra={"action": "scale_up", "service": service})
+        if update_desired_count(self.cluster, service, target):
+            self._last_scaled[job] = now
+            PRESCALE_ACTIONS.labels(service=job).inc()
+            return target
+        return None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Forecaster cycle failed")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="forecaster", daemon=True)
+            self._thread.start()
+            logger.info("Forecaster started for %s", ", ".join(self.services))
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -1,16 +1,34 @@
 from langgraph.graph import StateGraph, END
 from src.graph.state import AgentState
 from src.graph.nodes import analyst_node, auditor_node, decision_node, remediation_node, verification_node
+import time
+from functools import wraps
+
+def timed(name, node):
+    """
+    Records how long a node took (ms) in state['node_durations'], and keeps
+    the node's own execution_result in state['node_results'] (verification
+    overwrites execution_result, so the remediation outcome would be lost).
+    """
+    @wraps(node)
+    def wrapper(state):
+        started = time.perf_counter()
+        update = node(state) or {}
+        telemetry = {"node_durations": {name: (time.perf_counter() - started) * 1000}}
+        if "execution_result" in update:
+            telemetry["node_results"] = {name: update["execution_result"]}
+        return {**update, **telemetry}
+    return wrapper
 
 def create_graph():
     workflow = StateGraph(AgentState)
 
     # Define Nodes
-    workflow.add_node("analyst", analyst_node)
-    workflow.add_node("auditor", auditor_node)
-    workflow.add_node("decision", decision_node)
-    workflow.add_node("remediation", remediation_node)
-    workflow.add_node("verification", verification_node)
+    workflow.add_node("analyst", timed("analyst", analyst_node))
+    workflow.add_node("auditor", timed("auditor", auditor_node))
+    workflow.add_node("decision", timed("decision", decision_node))
+    workflow.add_node("remediation", timed("remediation", remediation_node))
+    workflow.add_node("verification", timed("verification", verification_node))
 
     # Define Edges
     # Parallel execution: Entry -> (Analyst, Auditor) -> Decision
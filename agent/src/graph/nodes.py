@@ -1,10 +1,13 @@
 from .state import AgentState, RemediationPlan
-from src.tools.cloudwatch_client import filter_log_events
+from src.tools.cloudwatch_client import filter_log_events, query_error_summary, choose_query_mode
 from src.tools.github_client import get_recent_commits, create_revert_pr
-from src.tools.ecs_client import restart_service, update_desired_count
+from src.tools.ecs_client import restart_service, update_desired_count, get_desired_count
+import logging
 import random
 import os
 
+logger = logging.getLogger(__name__)
+
 # ============================================================================
 # PHASE 3: Real Tool Integration
 # ============================================================================
@@ -16,26 +19,41 @@ def analyst_node(state: AgentState) -> AgentState:
     """
     alert_name = state['alert']['alert_name']
     service_name = state['alert']['service']
-    print(f"🕵️ Analyst Node: Analyzing alert '{alert_name}' for service '{service_name}'...")
+    logger.info("Analyst node: analyzing alert %s", alert_name, extra={"node": "analyst", "service": service_name})
     
     # 1. Derive Log Group Name from Service Name
     log_group = f"/ecs/{service_name}"
     if service_name == "localhost:8080":  # Testing override
         log_group = "/ecs/self-healing-devsecops-frontend-dev"
 
-    print(f"   🔍 Querying CloudWatch Logs: {log_group}")
+    # High-volume log groups are aggregated server-side by Logs Insights
+    mode = choose_query_mode(log_group)
+    logger.debug("Querying CloudWatch Logs (%s): %s", mode, log_group)
     
     # Graceful Degradation: If CloudWatch fails, continue with partial data
+    summary = None
     try:
-        logs = filter_log_events(log_group)
+        if mode == "insights":
+            summary = query_error_summary(log_group)
+            logs = [row["message"] for row in summary]
+        else:
+            logs = filter_log_events(log_group)
     except Exception as e:
-        print(f"⚠️ Graceful Degradation: CloudWatch unavailable ({e}). Proceeding without logs.")
+        logger.warning("Graceful degradation: CloudWatch unavailable (%s). Proceeding without logs.", e)
         logs = []
     
     # 2. Heuristic Analysis (Placeholder for LLM)
     analysis = "Unknown Issue"
     if not logs:
         analysis = "No logs found. Possible health check failure or network issue."
+    elif summary is not None:
+        # Rows are already grouped and sorted by frequency
+        error_rows = [r for r in summary if "Error" in r["message"] or "Exception" in r["message"]]
+        if error_rows:
+            total = sum(r["count"] for r in error_rows)
+            analysis = f"Found {total} error logs. Top error: {error_rows[0]['message'][:100]}..."
+        else:
+            analysis = "Logs found but no explicit errors detected."
     else:
         # Simple keyword matching for V1
         error_logs = [l for l in logs if "Error" in l or "Exception" in l]
@@ -44,7 +62,7 @@ def analyst_node(state: AgentState) -> AgentState:
         else:
             analysis = "Logs found but no explicit errors detected."
     
-    return {"logs": logs, "analysis": analysis}
+    return {"logs": logs, "log_summary": summary, "analysis": analysis}
 
 def auditor_node(state: AgentState) -> AgentState:
     """
@@ -52,13 +70,13 @@ def auditor_node(state: AgentState) -> AgentState:
     Implements graceful degradation if GitHub is unavailable.
     """
     service_name = state['alert']['service']
-    print(f"👮 Auditor Node: Checking recent commits for {service_name}...")
+    logger.info("Auditor node: checking recent commits", extra={"node": "auditor", "service": service_name})
     
     # Graceful Degradation: If GitHub fails, continue without commit data
     try:
         commits = get_recent_commits(service_name)
     except Exception as e:
-        print(f"⚠️ Graceful Degradation: GitHub unavailable ({e}). Proceeding without commit data.")
+        logger.warning("Graceful degradation: GitHub unavailable (%s). Proceeding without commit data.", e)
         commits = []
     
     return {"recent_commits": commits}
@@ -67,7 +85,7 @@ def verification_node(state: AgentState) -> AgentState:
     """
     Verifies if the remediation was successful.
     """
-    print("✅ Verification Node: Checking system health after remediation...")
+    logger.info("Verification node: checking system health after remediation", extra={"node": "verification"})
     
     # For now, we assume if we reached here without crash, it's tentatively okay.
     # Ideally, Query Prometheus again.
@@ -80,12 +98,12 @@ def verification_node(state: AgentState) -> AgentState:
 
 def decision_node(state: AgentState) -> AgentState:
     analysis = state.get('analysis')
-    print(f"⚖️ Decision Node: (Analysis: {analysis})")
+    logger.info("Decision node: analysis=%s", analysis, extra={"node": "decision"})
     
     # Circuit Breaker Logic
     retry_count = state.get("retry_count", 0)
     if retry_count > 2:
-        print("⛔ Circuit Breaker: Too many retries. Escalating.")
+        logger.warning("Circuit breaker: too many retries (%d). Escalating.", retry_count)
         return {"plan": {"action": "escalate", "reasoning": "Circuit breaker tripped.", "confidence": 1.0}}
 
     # Heuristic Decision Logic (Placeholder for LLM)
@@ -114,10 +132,10 @@ def decision_node(state: AgentState) -> AgentState:
         action = "restart_service" 
         confidence = 0.8
         
-    print(f"   👉 Decision: {action} (Confidence: {confidence})")
+    logger.info("Decision: %s", action, extra={"action": action, "confidence": confidence})
 
     if confidence < 0.7:
-        print(f"⚠️ Low Confidence ({confidence}). Escalating.")
+        logger.warning("Low confidence (%s). Escalating.", confidence)
         return {"plan": {"action": "escalate", "reasoning": "Low confidence in autonomous fix.", "confidence": confidence}}
     
     plan: RemediationPlan = {
@@ -148,10 +166,10 @@ def remediation_node(state: AgentState) -> AgentState:
     }
     
     if not ALLOWED_ACTIONS.get(action, False):
-        print(f"⛔ Feature Flag: Action '{action}' is disabled. Escalating.")
+        logger.warning("Feature flag: action %s is disabled. Escalating.", action)
         return {"execution_result": f"Action '{action}' is disabled by feature flag. Escalated to human operator."}
     
-    print(f"🛠️ Remediation Node: Executing {action}...")
+    logger.info("Remediation node: executing %s", action, extra={"node": "remediation", "action": action})
     
     execution_result = "Failed"
     
@@ -170,14 +188,21 @@ def remediation_node(state: AgentState) -> AgentState:
         # Scale up the service to handle increased load
         cluster = os.getenv("ECS_CLUSTER", "devsecops-cluster-dev")
         service = os.getenv("ECS_SERVICE", "frontend-app-dev")
-        current_count = 1  # Would fetch from ECS in production
-        new_count = current_count + 1
+        max_count = int(os.getenv("FORECAST_MAX_TASKS", "10"))
+        # Read the live count: the forecaster may already have scaled past any fixed guess
+        current_count = get_desired_count(cluster, service)
         
-        success = update_desired_count(cluster, service, new_count)
-        if success:
-             execution_result = f"Success: Scaled service to {new_count} tasks."
+        if not current_count:
+            execution_result = "Escalated to human operator: could not read current task count."
+        elif current_count >= max_count:
+            execution_result = f"Escalated to human operator: service already at max of {max_count} tasks."
         else:
-             execution_result = "Failure: Could not scale service."
+            new_count = current_count + 1
+            success = update_desired_count(cluster, service, new_count)
+            if success:
+                 execution_result = f"Success: Scaled service to {new_count} tasks."
+            else:
+                 execution_result = "Failure: Could not scale service."
     
     elif action == "revert_commit":
         # Revert a recent commit that may have caused the issue
@@ -1,4 +1,7 @@
-from typing import TypedDict, List, Optional, Dict, Any, Literal
+from typing import TypedDict, List, Optional, Dict, Any, Literal, Annotated
+
+def merge_dicts(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {**(left or {}), **(right or {})}
 
 class AlertInfo(TypedDict):
     alert_name: str
@@ -17,6 +20,7 @@ class AgentState(TypedDict):
     
     # MEMORY / CONTEXT
     logs: Optional[List[str]]
+    log_summary: Optional[List[Dict[str, Any]]]  # Server-side aggregated error rows (Logs Insights mode)
     recent_commits: Optional[List[Dict[str, Any]]]
     
     # OUTPUTS
@@ -27,3 +31,7 @@ class AgentState(TypedDict):
     # CONTROL FLOW
     retry_count: int
     error: Optional[str]
+    
+    # TELEMETRY
+    node_durations: Annotated[Dict[str, float], merge_dicts]  # Node name -> milliseconds
+    node_results: Annotated[Dict[str, str], merge_dicts]  # Node name -> execution_result it reported
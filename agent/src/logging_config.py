@@ -0,0 +1,204 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter
+
+# ============================================================================
+# Structured JSON logging for the hot path.
+# Callers only pay for a level check and a queue put: message formatting,
+# JSON encoding and the stdout write happen on a background listener thread.
+# ============================================================================
+
+MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "2000"))
+SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", "20"))
+SAMPLE_WINDOW_SECONDS = float(os.getenv("LOG_SAMPLE_WINDOW_SECONDS", "10"))
+QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+LOG_RECORDS_DROPPED = Counter('agent_log_records_dropped_total', 'Log records dropped because the logging queue was full')
+
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "correlation_id"}
+
+
+def get_correlation_id() -> Optional[str]:
+    return _correlation_id.get()
+
+
+@contextmanager
+def correlation_scope(correlation_id: Optional[str] = None):
+    """Tags every log line emitted inside the block (e.g. one alert's graph run) with a correlation id."""
+    correlation_id = correlation_id or uuid.uuid4().hex[:16]
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield correlation_id
+    finally:
+        _correlation_id.reset(token)
+
+
+def _truncate(value: Any) -> Any:
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    if len(text) > MAX_FIELD_CHARS:
+        return text[:MAX_FIELD_CHARS] + f"...[truncated {len(text) - MAX_FIELD_CHARS} chars]"
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with `extra=` fields and long payloads truncated."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": _truncate(record.getMessage()),
+        }
+        if getattr(record, "correlation_id", None):
+            payload["correlation_id"] = record.correlation_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = _truncate(value)
+        if record.exc_info:
+            payload["exception"] = _truncate(self.formatException(record.exc_info))
+        return json.dumps(payload, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """Captures the correlation id on the calling thread, before the record is queued."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = _correlation_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lets the first `burst` identical records (same logger, level, template,
+    args and correlation id) through per `window_seconds`, then drops the
+    rest. Only records below WARNING are sampled, and keying on the
+    correlation id keeps every alert's own trail intact. The next matching
+    record reports how many were suppressed; counts for keys that never
+    reappear are reported in a WARNING summary once their window expires.
+    Must be added after ContextFilter.
+    """
+
+    def __init__(self, burst: int = SAMPLE_BURST, window_seconds: float = SAMPLE_WINDOW_SECONDS,
+                 clock=time.monotonic, max_keys: int = 10000):
+        super().__init__()
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._seen: Dict[Tuple, list] = {}
+        self._last_sweep = clock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        try:
+            key = (record.name, record.levelno, record.msg, record.args, getattr(record, "correlation_id", None))
+            hash(key)
+        except TypeError:
+            return True  # Unhashable args (dicts) are never sampled
+
+        now = self._clock()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is None or now - entry[0] >= self.window_seconds:
+                self._seen[key] = [now, 1, 0]
+                if entry and entry[2]:
+                    record.suppressed = entry[2]
+                allowed = True
+            else:
+                entry[1] += 1
+                allowed = entry[1] <= self.burst
+                if not allowed:
+                    entry[2] += 1
+            expired = self._sweep(now)
+        # Logged outside the lock: the summary passes back through this filter
+        for (name, _, msg, _, correlation_id), count in expired:
+            logging.getLogger(__name__).warning("Log sampling suppressed %d repeats of %r from %s", count, msg, name,
+                                                extra={"sampled_correlation_id": correlation_id})
+        return allowed
+
+    def _sweep(self, now: float) -> List[Tuple[Tuple, int]]:
+        """Drops expired keys (at most once per window, or when full) and returns their unreported suppressions."""
+        if len(self._seen) < self.max_keys and now - self._last_sweep < self.window_seconds:
+            return []
+        self._last_sweep = now
+        full = len(self._seen) >= self.max_keys
+        expired = [key for key, entry in self._seen.items() if full or now - entry[0] >= self.window_seconds]
+        suppressed = []
+        for key in expired:
+            count = self._seen.pop(key)[2]
+            if count:
+                suppressed.append((key, count))
+        return suppressed
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queues raw records (formatting is deferred to the listener) and drops them when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: Optional[str] = None, stream=None) -> logging.Logger:
+    """Installs the queue handler on the root logger. Safe to call more than once."""
+    global _listener
+    root = logging.getLogger()
+    root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+    if _listener is not None:
+        return root
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    handler.addFilter(SamplingFilter())
+
+    root.handlers = [handler]
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return root
+
+
+def shutdown_logging():
+    """Flushes queued records and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
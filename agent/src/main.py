@@ -1,6 +1,18 @@
-from fastapi import FastAPI, Response
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from src.logging_config import configure_logging, correlation_scope, get_correlation_id
+from src.analytics import OutcomeStore, parse_window, remediation_result
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Self-Healing AI Agent")
 
@@ -18,6 +30,8 @@ async def metrics():
     return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 from src.graph.graph import create_graph
+from src.forecaster import Forecaster
+from src.streaming import JobRegistry, format_sse, run_job
 
 # Initialize Graph
 graph = create_graph()
@@ -26,33 +40,144 @@ graph = create_graph()
 async def root():
     return {"message": "Self-Healing AI Agent is running"}
 
-@app.post("/webhook")
-async def receive_alert(alert: dict):
-    print(f"📥 Webhook: Received alert: {alert}")
-    ALERTS_RECEIVED.inc()
-    
-    # Transform Alertmanager payload to AgentState
+# Outcome analytics (columnar store queried by /stats). The default lives next
+# to the agent package rather than the working directory.
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTCOMES_DB_PATH = os.getenv("OUTCOMES_DB_PATH", os.path.join(AGENT_DIR, "data", "outcomes.duckdb"))
+_outcomes: Optional[OutcomeStore] = None
+_outcomes_lock = threading.Lock()
+
+def get_outcomes() -> Optional[OutcomeStore]:
+    """
+    Opens the outcome store on first use. DuckDB takes an exclusive file lock,
+    so a second process (e.g. `uvicorn --workers 2`) can't open it; that
+    process keeps handling alerts without analytics and retries on next use.
+    """
+    global _outcomes
+    with _outcomes_lock:
+        if _outcomes is None:
+            try:
+                _outcomes = OutcomeStore(OUTCOMES_DB_PATH)
+            except Exception as e:
+                logger.warning("Outcome store unavailable at %s: %s", OUTCOMES_DB_PATH, e)
+                return None
+        return _outcomes
+
+def build_initial_state(alert: dict) -> dict:
+    """Transforms an Alertmanager payload into the graph's initial AgentState."""
     alert_info = {
         "alert_name": alert.get("groupLabels", {}).get("alertname", "Unknown"),
         "severity": alert.get("commonLabels", {}).get("severity", "unknown"),
         "service": alert.get("commonLabels", {}).get("instance", "unknown"),
         "details": alert
     }
-    
-    initial_state = {"alert": alert_info}
-    
-    # Execute Graph
-    print("🚀 invoking LangGraph...")
-    result = graph.invoke(initial_state)
-    
-    # Track remediation metrics
+    return {"alert": alert_info}
+
+def record_result(result: dict):
+    """Tracks remediation metrics for a finished graph run."""
     action = result.get("plan", {}).get("action", "unknown")
     REMEDIATIONS_ATTEMPTED.labels(action=action).inc()
-    if "Success" in result.get("execution_result", ""):
+    if remediation_result(result).startswith("Success"):
         REMEDIATIONS_SUCCESSFUL.labels(action=action).inc()
-    
-    print(f"✅ Execution Complete. Result: {result.get('execution_result')}")
-    return {"status": "processed", "result": result.get("execution_result")}
+    logger.info("Execution complete. Result: %s", result.get("execution_result"), extra={"action": action})
+    store = get_outcomes()
+    if store is None:
+        return
+    try:
+        store.record(result, correlation_id=get_correlation_id())
+    except Exception:
+        logger.exception("Failed to record remediation outcome")
+
+# Plain `def`: FastAPI runs it in the threadpool, so the blocking graph run
+# (rate-limit waits, Insights polling) doesn't stall the event loop or SSE streams
+@app.post("/webhook")
+def receive_alert(alert: dict):
+    with correlation_scope() as correlation_id:
+        logger.info("Webhook: received alert", extra={"alert": alert, "group_key": alert.get("groupKey")})
+        ALERTS_RECEIVED.inc()
+        
+        initial_state = build_initial_state(alert)
+        
+        # Execute Graph
+        logger.debug("Invoking LangGraph")
+        result = graph.invoke(initial_state)
+        record_result(result)
+        
+        return {"status": "processed", "result": result.get("execution_result"), "correlation_id": correlation_id}
+
+@app.get("/stats")
+def remediation_stats(window: str = "24h", since: Optional[str] = None, until: Optional[str] = None,
+                      service: Optional[str] = None, action: Optional[str] = None):
+    """MTTR, success rate by action/service and latency percentiles over a time window (blocking DuckDB query, so a plain def)."""
+    try:
+        end = datetime.fromisoformat(until.replace("Z", "+00:00")) if until else datetime.now(timezone.utc)
+        start = datetime.fromisoformat(since.replace("Z", "+00:00")) if since else end - parse_window(window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    store = get_outcomes()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Outcome store unavailable")
+    return store.stats(start, end, service=service, action=action)
+
+# ============================================================================
+# Predictive pre-scaling (feature flag, disabled by default)
+# ============================================================================
+
+forecaster = Forecaster() if os.getenv("ENABLE_PREDICTIVE_SCALING", "false").lower() == "true" else None
+
+@app.on_event("startup")
+async def start_forecaster():
+    if forecaster:
+        forecaster.start()
+
+@app.on_event("shutdown")
+async def stop_forecaster():
+    if forecaster:
+        forecaster.stop()
+
+# ============================================================================
+# Streaming: run the graph in the background and follow it over SSE
+# ============================================================================
+
+jobs = JobRegistry()
+_job_futures = set()
+
+def _job_finished(future):
+    _job_futures.discard(future)
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Job worker crashed", exc_info=future.exception())
+
+@app.post("/jobs", status_code=202)
+async def create_job(alert: dict):
+    """Accepts an alert and returns immediately; progress is streamed from /jobs/{job_id}/events."""
+    ALERTS_RECEIVED.inc()
+    loop = asyncio.get_running_loop()
+    job = jobs.create(loop)
+    logger.info("Job %s: received alert", job.job_id, extra={"alert": alert, "group_key": alert.get("groupKey")})
+    future = loop.run_in_executor(None, run_job, graph, job, build_initial_state(alert), record_result)
+    _job_futures.add(future)
+    future.add_done_callback(_job_finished)
+    return {"job_id": job.job_id, "events_url": f"/jobs/{job.job_id}/events"}
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, last_event_id: Optional[str] = Header(None)):
+    """Server-Sent Events: one event per finished stage, ending with `complete` or `failed`."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    resume_from = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    async def event_stream():
+        async for event in job.subscribe(resume_from):
+            yield format_sse(event)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,285 @@
+import random
+import re
+import time
+from types import SimpleNamespace
+from typing import List, Dict, Any, Optional
+
+import requests
+from botocore.exceptions import ClientError
+
+# ============================================================================
+# In-process fakes for the APIs the agent's tools talk to.
+# All timestamps are virtual seconds driven by SimClock, so convergence and
+# log bursts can be replayed thousands of times without sleeping.
+# ============================================================================
+
+class SimClock:
+    """Virtual clock shared by all fakes in a single simulated incident."""
+
+    def __init__(self, epoch: Optional[float] = None):
+        self.epoch = epoch if epoch is not None else time.time()
+        self.now = 0.0
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+    def sync(self):
+        """Anchors virtual "now" to wall-clock now, so tools computing windows from time.time() see recent events."""
+        self.epoch = time.time() - self.now
+
+    def epoch_millis(self, at: Optional[float] = None) -> int:
+        return int((self.epoch + (self.now if at is None else at)) * 1000)
+
+
+class FaultInjector:
+    """Makes a fake API fail a configurable fraction of calls (dependency outages)."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.error_rates: Dict[str, float] = {}
+
+    def maybe_fail(self, dependency: str, operation: str):
+        rate = self.error_rates.get(dependency, 0.0)
+        if rate and self.rng.random() < rate:
+            raise ClientError(
+                {"Error": {"Code": "ServiceUnavailableException", "Message": f"Simulated {dependency} outage"},
+                 "ResponseMetadata": {"HTTPStatusCode": 503}},
+                operation,
+            )
+
+
+class FakeECS:
+    """
+    Mimics the subset of the boto3 ECS client used by ecs_client.
+    Tasks take `task_start_seconds` of virtual time to reach RUNNING; a
+    crash-looping service never starts replacement tasks until a new
+    deployment is forced.
+    """
+
+    def __init__(self, clock: SimClock, faults: FaultInjector):
+        self.clock = clock
+        self.faults = faults
+        self.services: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[Dict[str, Any]] = []
+
+    def add_service(self, name: str, desired_count: int = 1, task_start_seconds: float = 30.0):
+        self.services[name] = {
+            "serviceName": name,
+            "status": "ACTIVE",
+            "desiredCount": desired_count,
+            "runningCount": desired_count,
+            "pending": [],
+            "crash_looping": False,
+            "task_start_seconds": task_start_seconds,
+            "deployment": 1,
+        }
+
+    def _get(self, service: str) -> Dict[str, Any]:
+        if service not in self.services:
+            raise ClientError({"Error": {"Code": "ServiceNotFoundException", "Message": f"Service {service} not found"}}, "UpdateService")
+        return self.services[service]
+
+    def _reconcile(self, svc: Dict[str, Any]):
+        """Runs the ECS scheduler up to the current virtual time."""
+        now = self.clock.now
+        started = [t for t in svc["pending"] if t <= now]
+        svc["pending"] = [t for t in svc["pending"] if t > now]
+        if not svc["crash_looping"]:
+            svc["runningCount"] = min(svc["desiredCount"], svc["runningCount"] + len(started))
+        if svc["runningCount"] > svc["desiredCount"]:
+            svc["runningCount"] = svc["desiredCount"]
+        missing = svc["desiredCount"] - svc["runningCount"] - len(svc["pending"])
+        if missing > 0 and not svc["crash_looping"]:
+            svc["pending"].extend([now + svc["task_start_seconds"]] * missing)
+
+    def stop_task(self, service: str, count: int = 1, crash_loop: bool = False):
+        svc = self._get(service)
+        svc["runningCount"] = max(0, svc["runningCount"] - count)
+        svc["crash_looping"] = svc["crash_looping"] or crash_loop
+        self._reconcile(svc)
+
+    def update_service(self, cluster: str, service: str, forceNewDeployment: bool = False, desiredCount: Optional[int] = None):
+        self.faults.maybe_fail("ecs", "UpdateService")
+        svc = self._get(service)
+        self.calls.append({"at": self.clock.now, "cluster": cluster, "service": service,
+                           "forceNewDeployment": forceNewDeployment, "desiredCount": desiredCount})
+        if forceNewDeployment:
+            svc["crash_looping"] = False
+            svc["deployment"] += 1
+        if desiredCount is not None:
+            svc["desiredCount"] = desiredCount
+        self._reconcile(svc)
+        return {"service": {k: v for k, v in svc.items() if k in ("serviceName", "status", "desiredCount", "runningCount")}}
+
+    def describe_services(self, cluster: str, services: List[str]):
+        self.faults.maybe_fail("ecs", "DescribeServices")
+        result = []
+        for name in services:
+            svc = self._get(name)
+            self._reconcile(svc)
+            result.append({k: v for k, v in svc.items() if k in ("serviceName", "status", "desiredCount", "runningCount")})
+        return {"services": result}
+
+    def settle(self, service: str) -> Optional[float]:
+        """
+        Advances virtual time until the service is steady (running == desired).
+        Returns the virtual time it became steady, or None if it never will.
+        """
+        svc = self._get(service)
+        self._reconcile(svc)
+        while svc["runningCount"] < svc["desiredCount"]:
+            if svc["crash_looping"] or not svc["pending"]:
+                return None
+            self.clock.now = max(self.clock.now, min(svc["pending"]))
+            self._reconcile(svc)
+        return self.clock.now
+
+
+class FakeCloudWatchLogs:
+    """Mimics the boto3 CloudWatch Logs client used by cloudwatch_client."""
+
+    class ResourceNotFoundException(Exception):
+        pass
+
+    def __init__(self, clock: SimClock, faults: FaultInjector):
+        self.clock = clock
+        self.faults = faults
+        self.log_groups: Dict[str, List[Dict[str, Any]]] = {}
+        self.queries: Dict[str, List[List[Dict[str, str]]]] = {}
+        self.exceptions = SimpleNamespace(ResourceNotFoundException=self.ResourceNotFoundException)
+
+    def create_log_group(self, name: str):
+        self.log_groups.setdefault(name, [])
+
+    def put_events(self, log_group: str, messages: List[str], spread_seconds: float = 0.0):
+        self.create_log_group(log_group)
+        step = spread_seconds / max(1, len(messages))
+        for i, message in enumerate(messages):
+            self.log_groups[log_group].append({"at": self.clock.now + i * step, "message": message})
+
+    def _events(self, log_group: str) -> List[Dict[str, Any]]:
+        # Timestamps are resolved lazily so they follow SimClock.sync()
+        return [{"timestamp": self.clock.epoch_millis(e["at"]), "message": e["message"]} for e in self.log_groups[log_group]]
+
+    @staticmethod
+    def _matches(message: str, filter_pattern: str) -> bool:
+        # CloudWatch term patterns: every unquoted term must appear (case-sensitive)
+        return all(term in message for term in filter_pattern.split())
+
+    def filter_log_events(self, logGroupName: str, filterPattern: str = "", startTime: int = 0, limit: int = 10000):
+        self.faults.maybe_fail("cloudwatch", "FilterLogEvents")
+        if logGroupName not in self.log_groups:
+            raise self.ResourceNotFoundException(f"Log group {logGroupName} does not exist")
+        events = [e for e in self._events(logGroupName)
+                  if e["timestamp"] >= startTime and self._matches(e["message"], filterPattern)]
+        return {"events": events[:limit], **({"nextToken": "more"} if len(events) > limit else {})}
+
+    def start_query(self, logGroupName: str, startTime: int, endTime: int, queryString: str):
+        """Supports the error-summary query shape built by cloudwatch_client (filter + stats by bin(1m), @message)."""
+        self.faults.maybe_fail("cloudwatch", "StartQuery")
+        if logGroupName not in self.log_groups:
+            raise self.ResourceNotFoundException(f"Log group {logGroupName} does not exist")
+        match = re.search(r"like /((?:\\.|[^/\\])*)/", queryString)
+        pattern = re.compile(match.group(1).replace("\\/", "/") if match else ".*")
+        limit = re.search(r"limit (\d+)", queryString)
+
+        buckets: Dict[tuple, int] = {}
+        for e in self._events(logGroupName):
+            if startTime * 1000 <= e["timestamp"] <= endTime * 1000 and pattern.search(e["message"]):
+                minute = time.strftime("%Y-%m-%d %H:%M:00.000", time.gmtime(e["timestamp"] // 60000 * 60))
+                buckets[(minute, e["message"])] = buckets.get((minute, e["message"]), 0) + 1
+        rows = sorted(buckets.items())
+        if limit:
+            rows = rows[:int(limit.group(1))]
+
+        query_id = f"sim-query-{len(self.queries) + 1}"
+        self.queries[query_id] = [[
+            {"field": "minute", "value": minute},
+            {"field": "@message", "value": message},
+            {"field": "count", "value": str(count)},
+        ] for (minute, message), count in rows]
+        return {"queryId": query_id}
+
+    def get_query_results(self, queryId: str):
+        self.faults.maybe_fail("cloudwatch", "GetQueryResults")
+        return {"status": "Complete", "results": self.queries.get(queryId, [])}
+
+    def stop_query(self, queryId: str):
+        return {"success": True}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, payload: Any):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error: {self._payload}", response=self)
+
+
+class FakeGitHub:
+    """Stands in for the `requests` module inside github_client."""
+
+    def __init__(self, clock: SimClock, faults: FaultInjector):
+        self.clock = clock
+        self.faults = faults
+        self.commits: List[Dict[str, Any]] = []
+        self.pulls: List[Dict[str, Any]] = []
+        self.branches: Dict[str, str] = {"main": "0" * 40}
+
+    def push_commit(self, sha: str, message: str, author: str = "Simulated Dev"):
+        self.commits.insert(0, {
+            "sha": sha,
+            "commit": {
+                "message": message,
+                "author": {"name": author, "email": "dev@example.com", "date": "2024-01-01T12:00:00Z"},
+            },
+        })
+        self.branches["main"] = sha
+
+    def _fault(self):
+        try:
+            self.faults.maybe_fail("github", "HTTP")
+        except ClientError:
+            return FakeResponse(503, {"message": "Simulated github outage"})
+        return None
+
+    def get(self, url: str, headers: Dict[str, str] = None, params: Dict[str, Any] = None):
+        failed = self._fault()
+        if failed:
+            return failed
+        if url.endswith("/commits"):
+            return FakeResponse(200, self.commits[:(params or {}).get("per_page", 30)])
+        if "/commits/" in url:
+            sha = url.rsplit("/", 1)[-1]
+            for commit in self.commits:
+                if commit["sha"] == sha:
+                    return FakeResponse(200, commit)
+            return FakeResponse(404, {"message": "No commit found"})
+        if "/git/refs/heads/" in url:
+            branch = url.rsplit("/", 1)[-1]
+            if branch in self.branches:
+                return FakeResponse(200, {"object": {"sha": self.branches[branch]}})
+            return FakeResponse(404, {"message": "Not Found"})
+        return FakeResponse(404, {"message": "Not Found"})
+
+    def post(self, url: str, headers: Dict[str, str] = None, json: Dict[str, Any] = None):
+        failed = self._fault()
+        if failed:
+            return failed
+        if url.endswith("/git/refs"):
+            branch = json["ref"].replace("refs/heads/", "")
+            if branch in self.branches:
+                return FakeResponse(422, {"message": "Reference already exists"})
+            self.branches[branch] = json["sha"]
+            return FakeResponse(201, {"ref": json["ref"]})
+        if url.endswith("/pulls"):
+            number = len(self.pulls) + 1
+            pr = {"number": number, "html_url": f"https://github.com/simulated/pull/{number}", **json}
+            self.pulls.append(pr)
+            return FakeResponse(201, pr)
+        return FakeResponse(404, {"message": "Not Found"})
@@ -0,0 +1,243 @@
+import argparse
+import contextlib
+import json
+import logging
+import os
+import random
+import time
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+import yaml
+
+from src.graph.graph import create_graph
+from src.logging_config import configure_logging, correlation_scope
+from src.simulation.fakes import SimClock, FaultInjector, FakeECS, FakeCloudWatchLogs, FakeGitHub
+from src.tools import cloudwatch_client, ecs_client, github_client, resilience
+
+# ============================================================================
+# Replayable in-process simulation of alert -> remediation -> recovery.
+# Scenario files live in chaos/simulations/ and follow the layout of the
+# chaos toolkit experiments in chaos/experiments/.
+# ============================================================================
+
+def load_scenario(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def _sample(value, rng: random.Random) -> float:
+    """Scenario numbers may be a constant or a [min, max] range."""
+    if isinstance(value, (list, tuple)):
+        return rng.uniform(value[0], value[1])
+    return float(value)
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 3)
+
+
+class Incident:
+    """Fresh set of fakes for a single simulated incident."""
+
+    def __init__(self, scenario: Dict[str, Any], rng: random.Random):
+        self.clock = SimClock()
+        self.faults = FaultInjector(rng)
+        self.ecs = FakeECS(self.clock, self.faults)
+        self.logs = FakeCloudWatchLogs(self.clock, self.faults)
+        self.github = FakeGitHub(self.clock, self.faults)
+
+        env = scenario.get("environment", {})
+        for svc in env.get("services", []):
+            self.ecs.add_service(svc["name"], svc.get("desired_count", 1), svc.get("task_start_seconds", 30))
+            self.logs.create_log_group(f"/ecs/{svc['name']}")
+        for commit in reversed(env.get("github", {}).get("commits", [])):
+            self.github.push_commit(commit["sha"], commit["message"], commit.get("author", "Simulated Dev"))
+
+    def apply(self, action: Dict[str, Any], rng: random.Random):
+        provider = action.get("provider", {})
+        func = provider.get("func")
+        args = provider.get("arguments", {})
+
+        if func == "stop_task":
+            self.ecs.stop_task(args["service"], int(_sample(args.get("count", 1), rng)), args.get("crash_loop", False))
+        elif func == "log_burst":
+            count = int(_sample(args.get("count", 10), rng))
+            self.logs.put_events(f"/ecs/{args['service']}", [args["message"]] * count, args.get("spread_seconds", 0))
+        elif func == "fail_dependency":
+            self.faults.error_rates[args["dependency"]] = float(args.get("error_rate", 1.0))
+        elif func == "push_commit":
+            self.github.push_commit(args["sha"], args["message"])
+        else:
+            raise ValueError(f"Unknown simulation action: {func}")
+
+        self.clock.advance(_sample(action.get("pauses", {}).get("after", 0), rng))
+
+
+class Simulator:
+    """
+    Runs a scenario repeatedly against the real LangGraph workflow with the
+    tool clients swapped for in-process fakes. MTTR is measured in virtual
+    time (injection -> service steady again), with the agent's real wall
+    time folded in between detection and recovery.
+    """
+
+    def __init__(self, scenario: Dict[str, Any], seed: int = 0, respect_rate_limits: bool = False, quiet: bool = True):
+        self.scenario = scenario
+        self.rng = random.Random(seed)
+        self.respect_rate_limits = respect_rate_limits
+        self.quiet = quiet
+        self.graph = create_graph()
+        self.incident: Optional[Incident] = None
+
+    @contextlib.contextmanager
+    def _patched_tools(self):
+        env = self.scenario.get("environment", {})
+        alert = self.scenario["alert"]
+        saved = {
+            (cloudwatch_client, "get_cw_client"): cloudwatch_client.get_cw_client,
+            (ecs_client, "get_ecs_client"): ecs_client.get_ecs_client,
+            (github_client, "requests"): github_client.requests,
+            (github_client, "GITHUB_TOKEN"): github_client.GITHUB_TOKEN,
+        }
+        env_vars = {
+            "ECS_CLUSTER": env.get("cluster", "devsecops-cluster-dev"),
+            "ECS_SERVICE": alert["service"],
+            **{k: str(v).lower() for k, v in env.get("feature_flags", {}).items()},
+        }
+        saved_env = {k: os.environ.get(k) for k in env_vars}
+
+        cloudwatch_client.get_cw_client = lambda: self.incident.logs
+        ecs_client.get_ecs_client = lambda: self.incident.ecs
+        github_client.requests = _IncidentProxy(self, "github")
+        github_client.GITHUB_TOKEN = "simulated-token"
+        os.environ.update(env_vars)
+        resilience.reset()
+        cloudwatch_client.reset_query_modes()
+        if not self.respect_rate_limits:
+            for dependency in ("cloudwatch", "ecs", "github"):
+                resilience.configure_rate_limit(dependency, rate=1e9, burst=1e9)
+        try:
+            yield
+        finally:
+            for (module, attr), value in saved.items():
+                setattr(module, attr, value)
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            resilience.reset()
+            cloudwatch_client.reset_query_modes()
+
+    def _initial_state(self) -> Dict[str, Any]:
+        alert = self.scenario["alert"]
+        return {"alert": {
+            "alert_name": alert.get("alertname", "Unknown"),
+            "severity": alert.get("severity", "unknown"),
+            "service": alert["service"],
+            "details": {"simulated": True, "scenario": self.scenario.get("title")},
+        }}
+
+    def run_incident(self) -> Dict[str, Any]:
+        self.incident = Incident(self.scenario, self.rng)
+        # A log burst in one incident must not switch later incidents to Insights
+        cloudwatch_client.reset_query_modes()
+        for action in self.scenario.get("method", []):
+            self.incident.apply(action, self.rng)
+
+        alert = self.scenario["alert"]
+        self.incident.clock.advance(_sample(alert.get("detection_seconds", 0), self.rng))
+
+        self.incident.clock.sync()
+        started = time.perf_counter()
+        result = self.graph.invoke(self._initial_state())
+        agent_seconds = time.perf_counter() - started
+        self.incident.clock.advance(agent_seconds)
+
+        recovered_at = self.incident.ecs.settle(alert["service"])
+        return {
+            "action": (result.get("plan") or {}).get("action", "unknown"),
+            "execution_result": result.get("execution_result", ""),
+            "agent_seconds": agent_seconds,
+            "recovered": recovered_at is not None,
+            "mttr_seconds": recovered_at,
+        }
+
+    @contextlib.contextmanager
+    def _quiet_logs(self):
+        """Silences the agent's per-incident logs, which would otherwise dominate the run time."""
+        if not self.quiet:
+            yield
+            return
+        agent_logger = logging.getLogger("src")
+        saved_level = agent_logger.level
+        agent_logger.setLevel(logging.CRITICAL)
+        try:
+            yield
+        finally:
+            agent_logger.setLevel(saved_level)
+
+    def run(self, incidents: int) -> Dict[str, Any]:
+        records = []
+        started = time.perf_counter()
+        with self._patched_tools(), self._quiet_logs():
+            for i in range(incidents):
+                with correlation_scope(f"sim-{i}"):
+                    records.append(self.run_incident())
+        wall_seconds = time.perf_counter() - started
+        return summarize(self.scenario, records, wall_seconds)
+
+
+class _IncidentProxy:
+    """Forwards attribute access to the current incident's fake (so patches survive incident resets)."""
+
+    def __init__(self, simulator: Simulator, name: str):
+        self._simulator = simulator
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(getattr(self._simulator.incident, self._name), attr)
+
+
+def summarize(scenario: Dict[str, Any], records: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    mttrs = [r["mttr_seconds"] for r in records if r["recovered"]]
+    agent_ms = [r["agent_seconds"] * 1000 for r in records]
+    return {
+        "scenario": scenario.get("title"),
+        "incidents": len(records),
+        "wall_seconds": round(wall_seconds, 3),
+        "incidents_per_minute": round(len(records) / wall_seconds * 60, 1) if wall_seconds else None,
+        "recovered": len(mttrs),
+        "recovery_rate": round(len(mttrs) / len(records), 4) if records else None,
+        "mttr_seconds": {
+            "mean": round(sum(mttrs) / len(mttrs), 3) if mttrs else None,
+            "p50": _percentile(mttrs, 50),
+            "p95": _percentile(mttrs, 95),
+        },
+        "agent_latency_ms": {
+            "p50": _percentile(agent_ms, 50),
+            "p95": _percentile(agent_ms, 95),
+            "p99": _percentile(agent_ms, 99),
+        },
+        "actions": dict(Counter(r["action"] for r in records)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a simulated incident scenario against the agent graph.")
+    parser.add_argument("scenario", help="Path to a scenario file (e.g. ../chaos/simulations/container-crash.yaml)")
+    parser.add_argument("-n", "--incidents", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--respect-rate-limits", action="store_true", help="Keep production token-bucket limits")
+    parser.add_argument("--verbose", action="store_true", help="Show agent output for every incident")
+    args = parser.parse_args()
+    configure_logging()
+
+    simulator = Simulator(load_scenario(args.scenario), seed=args.seed,
+                          respect_rate_limits=args.respect_rate_limits, quiet=not args.verbose)
+    print(json.dumps(simulator.run(args.incidents), indent=2))
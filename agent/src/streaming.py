@@ -0,0 +1,136 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from src.logging_config import correlation_scope
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Alert jobs streamed over Server-Sent Events.
+# The graph runs on a worker thread via `graph.stream`; each node update is
+# published to the job and fanned out to any number of SSE subscribers.
+# ============================================================================
+
+MAX_JOBS = 1000
+
+# Node name -> SSE event name, plus the fields worth sending to dashboards
+STAGES = {
+    "analyst": "analysis_ready",
+    "auditor": "audit_ready",
+    "decision": "plan_chosen",
+    "remediation": "remediation_issued",
+    "verification": "verification_status",
+}
+
+
+def summarize_update(node: str, update: Dict[str, Any]) -> Dict[str, Any]:
+    """Keeps SSE payloads small: counts instead of raw logs/commits."""
+    if node == "analyst":
+        return {"analysis": update.get("analysis"), "log_count": len(update.get("logs") or [])}
+    if node == "auditor":
+        commits = update.get("recent_commits") or []
+        return {"commit_count": len(commits), "latest_sha": commits[0].get("sha") if commits else None}
+    if node == "decision":
+        return {"plan": update.get("plan")}
+    return {k: v for k, v in update.items() if k in ("execution_result", "error", "retry_count")}
+
+
+class AlertJob:
+    """Event log for one alert's graph run. Safe to publish from a worker thread."""
+
+    def __init__(self, job_id: str, loop: asyncio.AbstractEventLoop):
+        self.job_id = job_id
+        self.events: List[Dict[str, Any]] = []
+        self.done = False
+        self.result: Optional[Dict[str, Any]] = None
+        self._loop = loop
+        self._changed = asyncio.Event()
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        try:
+            self._loop.call_soon_threadsafe(self._append, event, data)
+        except RuntimeError:
+            # Loop already closed (server shutting down); nobody is listening
+            logger.warning("Job %s: event loop closed, dropped %s event", self.job_id, event)
+
+    def _append(self, event: str, data: Dict[str, Any]):
+        self.events.append({"id": len(self.events), "event": event, "data": data})
+        if event in ("complete", "failed"):
+            self.done = True
+        # Wake every current subscriber, then arm a fresh event for the next update
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self, last_event_id: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Replays buffered events after `last_event_id`, then follows live updates until the job ends."""
+        index = 0 if last_event_id is None else last_event_id + 1
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.done:
+                return
+            await self._changed.wait()
+
+
+class JobRegistry:
+    def __init__(self, max_jobs: int = MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, AlertJob]" = OrderedDict()
+
+    def create(self, loop: asyncio.AbstractEventLoop) -> AlertJob:
+        job = AlertJob(uuid.uuid4().hex[:16], loop)
+        self._jobs[job.job_id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id: str) -> Optional[AlertJob]:
+        return self._jobs.get(job_id)
+
+
+def run_job(graph, job: AlertJob, initial_state: Dict[str, Any],
+            on_result: Optional[Callable[[Dict[str, Any]], None]] = None):
+    """
+    Streams the graph node by node, publishing each stage to the job. Runs on a
+    worker thread. Always ends with a `complete` or `failed` event so
+    subscribers never hang, even if `on_result` raises.
+    """
+    with correlation_scope(job.job_id):
+        state = dict(initial_state, node_durations={}, node_results={})
+        job.publish("accepted", {"job_id": job.job_id, "alert": initial_state["alert"]["alert_name"]})
+        terminal = ("failed", {"error": "Job interrupted"})
+        try:
+            for chunk in graph.stream(initial_state, stream_mode="updates"):
+                for node, update in chunk.items():
+                    update = update or {}
+                    # Mirror the graph's merge_dicts reducers for the telemetry keys
+                    merged = {key: {**state[key], **(update.get(key) or {})} for key in ("node_durations", "node_results")}
+                    state.update(update, **merged)
+                    job.publish(STAGES.get(node, node), {
+                        "node": node,
+                        "duration_ms": (update.get("node_durations") or {}).get(node),
+                        **summarize_update(node, update),
+                    })
+        except Exception as e:
+            logger.exception("Streaming job %s failed", job.job_id)
+            terminal = ("failed", {"error": str(e)})
+        else:
+            job.result = state
+            terminal = ("complete", {"execution_result": state.get("execution_result"),
+                                     "action": (state.get("plan") or {}).get("action")})
+            if on_result:
+                try:
+                    on_result(state)
+                except Exception:
+                    logger.exception("Job %s: result callback failed", job.job_id)
+        finally:
+            job.publish(*terminal)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
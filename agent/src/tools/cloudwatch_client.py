@@ -1,13 +1,27 @@
 import boto3
+import logging
 import os
+import re
 import time
 from typing import List, Dict, Any
+from src.tools.resilience import guarded
+
+logger = logging.getLogger(__name__)
 
 # Connection setup
 AWS_REGION = os.getenv("AWS_REGION", "ap-southeast-2")
 LOCAL_DEV = os.getenv("LOCAL_DEV", "false").lower() == "true"
 AWS_ENDPOINT_URL = os.getenv("AWS_ENDPOINT_URL", None)
 
+# Query mode policy: "filter" pulls raw events, "insights" aggregates server-side.
+# "auto" starts with filter and switches a log group to Insights once a filter
+# call returns a full page of matches.
+FILTER_PAGE_LIMIT = 50
+HIGH_VOLUME_TTL_SECONDS = int(os.getenv("HIGH_VOLUME_TTL_SECONDS", "3600"))
+# Insights returns at most 10,000 rows; (minute, message) pairs stay well below that
+INSIGHTS_MAX_ROWS = 10000
+_high_volume_groups: Dict[str, float] = {}
+
 def get_cw_client():
     if LOCAL_DEV:
         return boto3.client(
@@ -19,6 +33,7 @@ def get_cw_client():
         )
     return boto3.client("logs", region_name=AWS_REGION)
 
+@guarded("cloudwatch", fallback=lambda e: [])
 def filter_log_events(log_group_name: str, filter_pattern: str = "ERROR", start_time_minutes: int = 15) -> List[str]:
     """
     Fetches log events from CloudWatch Logs that match a filter pattern.
@@ -41,19 +56,123 @@ def filter_log_events(log_group_name: str, filter_pattern: str = "ERROR", start_
             logGroupName=log_group_name,
             filterPattern=filter_pattern,
             startTime=start_time,
-            limit=50
+            limit=FILTER_PAGE_LIMIT
         )
         
         events = response.get('events', [])
+        # nextToken also shows up on short or empty pages (the scan stopped early),
+        # so only a full page counts as high volume
+        if len(events) >= FILTER_PAGE_LIMIT:
+            _high_volume_groups[log_group_name] = time.time()
         messages = [event['message'] for event in events]
         return messages
 
     except client.exceptions.ResourceNotFoundException:
-        print(f"❌ Log group {log_group_name} not found.")
+        logger.warning("Log group %s not found.", log_group_name)
         return []
     except Exception as e:
-        print(f"❌ Error fetching logs: {e}")
+        logger.error("Error fetching logs from %s: %s", log_group_name, e)
+        raise
+
+def reset_query_modes():
+    """Forgets which log groups were seen as high volume (used by tests and the simulator)."""
+    _high_volume_groups.clear()
+
+def choose_query_mode(log_group_name: str) -> str:
+    """
+    Picks "filter" or "insights" for a log group based on LOG_QUERY_MODE and
+    the volume observed on previous fetches.
+    """
+    mode = os.getenv("LOG_QUERY_MODE", "auto").lower()
+    if mode in ("filter", "insights"):
+        return mode
+
+    marked_at = _high_volume_groups.get(log_group_name)
+    if marked_at and time.time() - marked_at < HIGH_VOLUME_TTL_SECONDS:
+        return "insights"
+    return "filter"
+
+def build_error_summary_query(message_regex: str = "ERROR") -> str:
+    """
+    Logs Insights query counting matching messages per minute. `message_regex`
+    is a regular expression (not a filter_log_events term pattern); unescaped
+    "/" is escaped so it can't close the /.../ literal early.
+    """
+    escaped = re.sub(r"(?<!\\)/", r"\/", message_regex)
+    return (
+        "fields @timestamp, @message"
+        f" | filter @message like /{escaped}/"
+        " | stats count(*) as count by bin(1m) as minute, @message"
+        f" | limit {INSIGHTS_MAX_ROWS}"
+    )
+
+@guarded("cloudwatch", fallback=lambda e: [])
+def query_error_summary(log_group_name: str, message_regex: str = "ERROR", start_time_minutes: int = 15,
+                        timeout_seconds: float = 10.0, poll_interval: float = 0.25,
+                        limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Runs a Logs Insights query that counts matching messages per minute
+    server-side, then folds the minute buckets into one row per message.
+    
+    Args:
+        log_group_name: The name of the log group (e.g., /ecs/frontend-app-dev)
+        message_regex: Regex the message must match (e.g., "ERROR|Exception")
+        start_time_minutes: How many minutes back to search
+        timeout_seconds: Give up (and stop the query) after this long
+        poll_interval: Initial delay between get_query_results polls (doubles up to 1s)
+        limit: Maximum number of distinct messages to return
+        
+    Returns:
+        Rows of {"message", "count", "first_seen", "last_seen", "per_minute"},
+        most frequent first. first_seen/last_seen are minute buckets and
+        per_minute is a list of {"minute", "count"} in time order.
+    """
+    client = get_cw_client()
+    
+    # Insights expects epoch seconds, not milliseconds
+    end_time = int(time.time())
+    start_time = end_time - start_time_minutes * 60
+    
+    try:
+        query_id = client.start_query(
+            logGroupName=log_group_name,
+            startTime=start_time,
+            endTime=end_time,
+            queryString=build_error_summary_query(message_regex)
+        )['queryId']
+    except client.exceptions.ResourceNotFoundException:
+        logger.warning("Log group %s not found.", log_group_name)
         return []
+    
+    deadline = time.monotonic() + timeout_seconds
+    delay = poll_interval
+    while True:
+        response = client.get_query_results(queryId=query_id)
+        status = response.get('status')
+        if status == 'Complete':
+            break
+        if status in ('Failed', 'Cancelled', 'Timeout', 'Unknown'):
+            raise RuntimeError(f"Logs Insights query {query_id} ended with status {status}")
+        if time.monotonic() + delay > deadline:
+            client.stop_query(queryId=query_id)
+            raise TimeoutError(f"Logs Insights query {query_id} did not finish in {timeout_seconds}s")
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+    
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for result in response.get('results', []):
+        fields = {f['field']: f['value'] for f in result}
+        message = fields.get('@message', '')
+        row = grouped.setdefault(message, {"message": message, "count": 0, "per_minute": []})
+        row["count"] += int(fields.get('count', 0))
+        row["per_minute"].append({"minute": fields.get('minute'), "count": int(fields.get('count', 0))})
+    
+    rows = sorted(grouped.values(), key=lambda r: r["count"], reverse=True)[:limit]
+    for row in rows:
+        row["per_minute"].sort(key=lambda b: b["minute"] or "")
+        row["first_seen"] = row["per_minute"][0]["minute"]
+        row["last_seen"] = row["per_minute"][-1]["minute"]
+    return rows
 
 if __name__ == "__main__":
     # Test execution
@@ -1,6 +1,11 @@
 import boto3
+import logging
 import os
+from typing import Optional
 from botocore.exceptions import ClientError
+from src.tools.resilience import guarded
+
+logger = logging.getLogger(__name__)
 
 # Connection setup
 AWS_REGION = os.getenv("AWS_REGION", "ap-southeast-2")
@@ -18,13 +23,14 @@ def get_ecs_client():
         )
     return boto3.client("ecs", region_name=AWS_REGION)
 
+@guarded("ecs", fallback=lambda e: False)
 def restart_service(cluster_name: str, service_name: str) -> bool:
     """
     Restarts an ECS service by forcing a new deployment.
     """
     client = get_ecs_client()
     try:
-        print(f"🔄 Restarting ECS Service: {service_name} in cluster {cluster_name}...")
+        logger.info("Restarting ECS service %s in cluster %s", service_name, cluster_name)
         response = client.update_service(
             cluster=cluster_name,
             service=service_name,
@@ -32,29 +38,47 @@ def restart_service(cluster_name: str, service_name: str) -> bool:
         )
         # Check if status is correct
         status = response.get('service', {}).get('status')
-        print(f"✅ Service update initiated. Status: {status}")
+        logger.info("Service update initiated. Status: %s", status)
         return True
     except ClientError as e:
-        print(f"❌ Failed to restart service: {e}")
-        return False
+        logger.error("Failed to restart service %s: %s", service_name, e)
+        raise
 
+@guarded("ecs", fallback=lambda e: False)
 def update_desired_count(cluster_name: str, service_name: str, desired_count: int) -> bool:
     """
     Updates the desired count of tasks for an ECS service.
     """
     client = get_ecs_client()
     try:
-        print(f"⚖️  Scaling ECS Service: {service_name} to {desired_count} tasks...")
+        logger.info("Scaling ECS service %s to %d tasks", service_name, desired_count)
         response = client.update_service(
             cluster=cluster_name,
             service=service_name,
             desiredCount=desired_count
         )
-        print(f"✅ Scale update initiated.")
+        logger.info("Scale update initiated for %s", service_name)
         return True
     except ClientError as e:
-        print(f"❌ Failed to update desired count: {e}")
-        return False
+        logger.error("Failed to update desired count for %s: %s", service_name, e)
+        raise
+
+@guarded("ecs", fallback=lambda e: None)
+def get_desired_count(cluster_name: str, service_name: str) -> Optional[int]:
+    """
+    Returns the current desired task count of an ECS service, or None if unknown.
+    """
+    client = get_ecs_client()
+    try:
+        response = client.describe_services(cluster=cluster_name, services=[service_name])
+        services = response.get('services', [])
+        if not services:
+            logger.warning("ECS service %s not found in cluster %s", service_name, cluster_name)
+            return None
+        return services[0].get('desiredCount')
+    except ClientError as e:
+        logger.error("Failed to describe service %s: %s", service_name, e)
+        raise
 
 if __name__ == "__main__":
     # Test execution
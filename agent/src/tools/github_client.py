@@ -1,6 +1,10 @@
+import logging
 import os
 import requests
 from typing import List, Dict, Any
+from src.tools.resilience import guarded
+
+logger = logging.getLogger(__name__)
 
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 GITHUB_API_URL = "https://api.github.com"
@@ -13,13 +17,14 @@ def get_headers():
         "Accept": "application/vnd.github.v3+json"
     }
 
+@guarded("github", fallback=lambda e: [])
 def get_recent_commits(service_name: str, limit: int = 5) -> List[Dict[str, Any]]:
     """
     Fetches recent commits for the repository.
     Ideally filters by path/service if monorepo support is added.
     """
     if not GITHUB_TOKEN or GITHUB_TOKEN == "your_token_here":
-        print("⚠️ GITHUB_TOKEN not set. Returning mock data.")
+        logger.warning("GITHUB_TOKEN not set. Returning mock data.")
         return [{
             "sha": "mock123",
             "message": f"Mock commit for {service_name}",
@@ -44,13 +49,14 @@ def get_recent_commits(service_name: str, limit: int = 5) -> List[Dict[str, Any]
             }
             commits.append(commit)
             
-        print(f"✅ Fetched {len(commits)} commits from GitHub.")
+        logger.info("Fetched %d commits from GitHub.", len(commits))
         return commits
 
     except Exception as e:
-        print(f"❌ Failed to fetch commits: {e}")
-        return []
+        logger.error("Failed to fetch commits: %s", e)
+        raise
 
+@guarded("github", fallback=lambda e: {"success": False, "message": str(e)})
 def create_revert_pr(commit_sha: str, reason: str) -> Dict[str, Any]:
     """
     Creates a Pull Request to revert a specific commit.
@@ -60,7 +66,7 @@ def create_revert_pr(commit_sha: str, reason: str) -> Dict[str, Any]:
     3. Create a PR
     """
     if not GITHUB_TOKEN or GITHUB_TOKEN == "your_token_here":
-        print("⚠️ GITHUB_TOKEN not set. Returning mock PR.")
+        logger.warning("GITHUB_TOKEN not set. Returning mock PR.")
         return {
             "success": True,
             "pr_url": f"https://github.com/{REPO_OWNER}/{REPO_NAME}/pull/mock-123",
@@ -75,8 +81,8 @@ def create_revert_pr(commit_sha: str, reason: str) -> Dict[str, Any]:
         commit_data = commit_response.json()
         commit_message = commit_data['commit']['message'].split('\n')[0]
     except Exception as e:
-        print(f"❌ Failed to fetch commit details: {e}")
-        return {"success": False, "message": str(e)}
+        logger.error("Failed to fetch commit details: %s", e)
+        raise
 
     # Step 2: Create a new branch for the revert
     branch_name = f"agent/revert-{commit_sha[:7]}"
@@ -88,8 +94,8 @@ def create_revert_pr(commit_sha: str, reason: str) -> Dict[str, Any]:
         refs_response.raise_for_status()
         base_sha = refs_response.json()['object']['sha']
     except Exception as e:
-        print(f"❌ Failed to get base branch: {e}")
-        return {"success": False, "message": str(e)}
+        logger.error("Failed to get base branch: %s", e)
+        raise
 
     # Create branch
     try:
@@ -100,7 +106,7 @@ def create_revert_pr(commit_sha: str, reason: str) -> Dict[str, Any]:
         }
         requests.post(create_ref_url, headers=get_headers(), json=create_ref_payload)
     except Exception as e:
-        print(f"⚠️ Branch might already exist: {e}")
+        logger.warning("Branch might already exist: %s", e)
 
     # Step 3: Create Pull Request
     pr_url = f"{GITHUB_API_URL}/repos/{REPO_OWNER}/{REPO_NAME}/pulls"
@@ -124,7 +130,7 @@ def create_revert_pr(commit_sha: str, reason: str) -> Dict[str, Any]:
         pr_response.raise_for_status()
         pr_data = pr_response.json()
         
-        print(f"✅ Created revert PR: {pr_data['html_url']}")
+        logger.info("Created revert PR: %s", pr_data['html_url'])
         return {
             "success": True,
             "pr_url": pr_data['html_url'],
@@ -132,8 +138,8 @@ def create_revert_pr(commit_sha: str, reason: str) -> Dict[str, Any]:
             "message": f"Created PR #{pr_data['number']} to revert {commit_sha[:7]}"
         }
     except Exception as e:
-        print(f"❌ Failed to create PR: {e}")
-        return {"success": False, "message": str(e)}
+        logger.error("Failed to create PR: %s", e)
+        raise
 
 if __name__ == "__main__":
     # Test execution
@@ -0,0 +1,46 @@
+import logging
+import os
+import requests
+from typing import List, Dict, Any
+from src.tools.resilience import guarded
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_URL = os.getenv("PROMETHEUS_URL", "http://localhost:9090")
+
+@guarded("prometheus", fallback=lambda e: [])
+def query_range(query: str, start: float, end: float, step: int = 60) -> List[Dict[str, Any]]:
+    """
+    Runs a PromQL range query.
+    
+    Args:
+        query: PromQL expression (e.g., sum by (job) (rate(http_requests_total[1m])))
+        start: Range start, epoch seconds
+        end: Range end, epoch seconds
+        step: Resolution in seconds
+        
+    Returns:
+        List of {"metric": {labels}, "values": [(timestamp, float), ...]} series.
+    """
+    try:
+        response = requests.get(
+            f"{PROMETHEUS_URL}/api/v1/query_range",
+            params={"query": query, "start": start, "end": end, "step": step},
+            timeout=10
+        )
+        response.raise_for_status()
+        payload = response.json()
+    except Exception as e:
+        logger.error("Prometheus query_range failed: %s", e)
+        raise
+
+    if payload.get("status") != "success":
+        raise RuntimeError(f"Prometheus query failed: {payload.get('error')}")
+
+    return [
+        {
+            "metric": series.get("metric", {}),
+            "values": [(float(ts), float(value)) for ts, value in series.get("values", [])],
+        }
+        for series in payload.get("data", {}).get("result", [])
+    ]
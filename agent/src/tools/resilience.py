@@ -0,0 +1,276 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, Tuple
+
+import requests
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+# Circuit breaker states (value exported on /metrics)
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_STATE = Gauge('agent_circuit_breaker_state', 'Circuit breaker state per dependency (0=closed, 1=half-open, 2=open)', ['dependency'])
+BREAKER_REJECTIONS = Counter('agent_circuit_breaker_rejections_total', 'Calls rejected because the circuit was open', ['dependency'])
+BREAKER_FAILURES = Counter('agent_dependency_failures_total', 'Transient failures (throttling, 5xx, timeouts, connection errors) of a downstream dependency', ['dependency'])
+RATE_LIMITED = Counter('agent_rate_limited_total', 'Calls rejected by the token-bucket rate limiter', ['dependency'])
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited because the dependency is known to be down."""
+
+
+class RateLimitExceeded(Exception):
+    """Raised when no rate-limit token became available within the allowed wait."""
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker (closed -> open -> half-open -> closed).
+    Opens when the error rate over the last `window_seconds` reaches
+    `failure_rate_threshold` with at least `min_calls` samples, then fails fast
+    for `open_seconds` before letting a single probe call through.
+    """
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5, min_calls: int = 5,
+                 window_seconds: float = 60.0, open_seconds: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls: Deque[Tuple[float, bool]] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        BREAKER_STATE.labels(dependency=name).set(STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def release_probe(self):
+        """Frees a half-open probe slot without judging the dependency (e.g. call was rate limited)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._calls.clear()
+                self._set_state(CLOSED)
+                return
+            self._record(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trip()
+                return
+            self._record(False)
+            failures = sum(1 for _, ok in self._calls if not ok)
+            if len(self._calls) >= self.min_calls and failures / len(self._calls) >= self.failure_rate_threshold:
+                self._trip()
+
+    def _record(self, ok: bool):
+        now = self._clock()
+        self._calls.append((now, ok))
+        cutoff = now - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+
+    def _trip(self):
+        self._opened_at = self._clock()
+        self._calls.clear()
+        self._set_state(OPEN)
+
+    def _maybe_half_open(self):
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._set_state(HALF_OPEN)
+
+    def _set_state(self, state: str):
+        if state != self._state:
+            logger.warning("Circuit breaker %s: %s -> %s", self.name, self._state, state)
+        self._state = state
+        self._probe_in_flight = False
+        BREAKER_STATE.labels(dependency=self.name).set(STATE_VALUES[state])
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter. Refills `rate` tokens per second up to `capacity`.
+    `acquire` waits at most `max_wait` seconds for a token.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError(f"Rate limit must be > 0 requests/sec (got {rate})")
+        if capacity < 1:
+            raise ValueError(f"Rate limit burst must be >= 1 (got {capacity})")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, max_wait: float = 0.0) -> bool:
+        deadline = self._clock() + max_wait
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if self._clock() + wait > deadline:
+                return False
+            self._sleep(wait)
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+# Per-dependency defaults (requests/sec, burst), overridable with
+# <DEPENDENCY>_RATE_LIMIT / <DEPENDENCY>_RATE_BURST. ECS update_service is
+# throttled far below the other APIs, so it gets a conservative bucket to
+# survive alert storms. Like the breaker settings, these are read when the
+# limiter is first created.
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_LIMITERS: Dict[str, TokenBucket] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+DEFAULT_RATE_LIMITS = {
+    "cloudwatch": (5.0, 10.0),
+    "ecs": (1.0, 5.0),
+    "github": (1.0, 5.0),
+}
+
+# Error codes that mean "try again later" rather than "this request is wrong"
+TRANSIENT_ERROR_CODES = {
+    "Throttling", "ThrottlingException", "ThrottledException", "TooManyRequestsException",
+    "RequestLimitExceeded", "LimitExceededException", "ServiceUnavailable", "ServiceUnavailableException",
+    "InternalFailure", "InternalServerError", "InternalError", "ServerException", "RequestTimeout",
+    "RequestTimeoutException",
+}
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    True for failures that say the dependency itself is unhealthy: throttling,
+    5xx, timeouts and connection errors. Caller/config errors (unknown service,
+    invalid parameters, 4xx like "PR already exists") return False.
+    """
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code", "")
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return code in TRANSIENT_ERROR_CODES or status >= 500 or status == 429
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else 0
+        return status >= 500 or status == 429
+    return isinstance(error, (BotoConnectionError, HTTPClientError, requests.ConnectionError,
+                              requests.Timeout, ConnectionError, TimeoutError))
+
+
+def get_breaker(dependency: str) -> CircuitBreaker:
+    with _REGISTRY_LOCK:
+        if dependency not in _BREAKERS:
+            _BREAKERS[dependency] = CircuitBreaker(
+                dependency,
+                failure_rate_threshold=_env_float("CIRCUIT_FAILURE_RATE", 0.5),
+                min_calls=int(_env_float("CIRCUIT_MIN_CALLS", 5)),
+                window_seconds=_env_float("CIRCUIT_WINDOW_SECONDS", 60.0),
+                open_seconds=_env_float("CIRCUIT_OPEN_SECONDS", 30.0),
+            )
+        return _BREAKERS[dependency]
+
+
+def get_rate_limiter(dependency: str) -> TokenBucket:
+    with _REGISTRY_LOCK:
+        if dependency not in _LIMITERS:
+            rate, burst = DEFAULT_RATE_LIMITS.get(dependency, (5.0, 10.0))
+            prefix = dependency.upper()
+            _LIMITERS[dependency] = TokenBucket(_env_float(f"{prefix}_RATE_LIMIT", rate),
+                                                _env_float(f"{prefix}_RATE_BURST", burst))
+        return _LIMITERS[dependency]
+
+
+def configure_rate_limit(dependency: str, rate: float, burst: float):
+    """Replaces the token bucket for a dependency (e.g. to lift limits in simulations)."""
+    with _REGISTRY_LOCK:
+        _LIMITERS[dependency] = TokenBucket(rate, burst)
+
+
+def reset():
+    """Drops all breakers and limiters (used by tests and the simulator)."""
+    with _REGISTRY_LOCK:
+        _BREAKERS.clear()
+        _LIMITERS.clear()
+
+
+def guarded(dependency: str, fallback: Callable[[Exception], Any], max_wait: float = 2.0):
+    """
+    Decorator that wraps a tool call with the dependency's rate limiter and
+    circuit breaker. Any exception escaping the tool is converted to
+    `fallback(exc)`, so callers keep the same return contract whether the
+    dependency is slow, down, or short-circuited. Only transient errors (see
+    `is_transient`) count against the breaker, so one misconfigured service
+    name can't block calls for every other service.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            breaker = get_breaker(dependency)
+            if not breaker.allow_request():
+                BREAKER_REJECTIONS.labels(dependency=dependency).inc()
+                return fallback(CircuitOpenError(f"Circuit '{dependency}' is open"))
+
+            if not get_rate_limiter(dependency).acquire(max_wait):
+                RATE_LIMITED.labels(dependency=dependency).inc()
+                breaker.release_probe()
+                return fallback(RateLimitExceeded(f"Rate limit exceeded for '{dependency}'"))
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if is_transient(e):
+                    BREAKER_FAILURES.labels(dependency=dependency).inc()
+                    breaker.record_failure()
+                else:
+                    breaker.release_probe()
+                return fallback(e)
+            breaker.record_success()
+            return result
+        return wrapper
+    return decorator
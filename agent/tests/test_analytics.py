@@ -0,0 +1,102 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from src.analytics import OutcomeStore, parse_window, alert_started_at
+
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+def make_result(action="restart_service", service="frontend", success=True, started_minutes_ago=5):
+    return {
+        "alert": {
+            "alert_name": "ServiceDown",
+            "severity": "critical",
+            "service": service,
+            "details": {"alerts": [{"startsAt": (NOW - timedelta(minutes=started_minutes_ago)).isoformat()}]},
+        },
+        "plan": {"action": action, "confidence": 0.9},
+        # Verification always reports recovery; only the remediation node's result says whether the fix worked
+        "execution_result": "Success: System recovered.",
+        "node_results": {
+            "remediation": "Success: Service restarted." if success else "Failure: Could not restart service.",
+            "verification": "Success: System recovered.",
+        },
+        "node_durations": {"analyst": 100.0, "auditor": 10.0, "decision": 1.0, "remediation": 50.0, "verification": 1.0},
+    }
+
+@pytest.fixture
+def store():
+    store = OutcomeStore(":memory:")
+    yield store
+    store.close()
+
+def test_stats_success_rate_and_mttr_by_action(store):
+    """Stats should break success rate and MTTR down by action and service."""
+    store.record(make_result(), correlation_id="a", finished_at=NOW)
+    store.record(make_result(started_minutes_ago=15), correlation_id="b", finished_at=NOW)
+    store.record(make_result(action="scale_up", service="cart", success=False), correlation_id="c", finished_at=NOW)
+
+    stats = store.stats(NOW - timedelta(hours=1), NOW + timedelta(seconds=1))
+
+    assert stats["total"] == 3
+    assert stats["success_rate"] == pytest.approx(2 / 3)
+    assert stats["mttr_seconds"]["mean"] == pytest.approx(600.0)
+    assert stats["latency_ms"]["p50"] == pytest.approx(162.0)
+    by_action = {row["action"]: row for row in stats["by_action"]}
+    assert by_action["restart_service"]["success_rate"] == 1.0
+    assert by_action["scale_up"]["success_rate"] == 0.0
+    assert {row["service"] for row in stats["by_service"]} == {"frontend", "cart"}
+
+def test_stats_respects_window_and_filters(store):
+    """Rows outside the window or not matching filters should be excluded."""
+    store.record(make_result(), finished_at=NOW - timedelta(days=2))
+    store.record(make_result(service="cart"), finished_at=NOW)
+
+    stats = store.stats(NOW - timedelta(hours=1), NOW + timedelta(seconds=1), service="frontend")
+    assert stats["total"] == 0
+
+    stats = store.stats(NOW - timedelta(days=3), NOW + timedelta(seconds=1), service="frontend")
+    assert stats["total"] == 1
+
+def test_escalation_is_not_counted_as_success(store):
+    """An escalated alert must not count as a success just because verification reported recovery."""
+    result = make_result(action="escalate")
+    result["node_results"]["remediation"] = "Escalated to human operator."
+    store.record(result, finished_at=NOW)
+
+    stats = store.stats(NOW - timedelta(hours=1), NOW + timedelta(seconds=1))
+    assert stats["success_rate"] == 0.0
+    row = store._query("SELECT remediation_result, verification_result FROM outcomes", [])[0]
+    assert row == {"remediation_result": "Escalated to human operator.", "verification_result": "Success: System recovered."}
+
+def test_mttr_is_null_without_alert_start(store):
+    """Without Alertmanager startsAt there is no MTTR; processing time stays in the latency columns."""
+    result = make_result()
+    result["alert"]["details"] = {}
+    store.record(result, finished_at=NOW)
+
+    stats = store.stats(NOW - timedelta(hours=1), NOW + timedelta(seconds=1))
+    assert stats["mttr_seconds"]["mean"] is None
+    assert stats["latency_ms"]["p50"] == pytest.approx(162.0)
+
+def test_parse_window():
+    assert parse_window("15m") == timedelta(minutes=15)
+    assert parse_window("7d") == timedelta(days=7)
+    with pytest.raises(ValueError):
+        parse_window("soon")
+
+def test_alert_started_at_ignores_unset_timestamps():
+    alert = {"details": {"alerts": [{"startsAt": "0001-01-01T00:00:00Z"}, {"startsAt": "2024-01-01T11:00:00Z"}]}}
+    assert alert_started_at(alert) == datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc)
+
+def test_locked_outcome_store_does_not_break_alert_handling():
+    """If another process holds the DuckDB lock, alerts are still handled and /stats returns 503."""
+    from unittest.mock import patch
+    import duckdb
+    from fastapi import HTTPException
+    from src import main
+
+    with patch.object(main, "_outcomes", None), \
+         patch("src.main.OutcomeStore", side_effect=duckdb.IOException("Could not set lock on file")):
+        main.record_result(make_result())
+        with pytest.raises(HTTPException) as excinfo:
+            main.remediation_stats()
+    assert excinfo.value.status_code == 503
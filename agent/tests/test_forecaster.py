@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+from src.forecaster import Forecaster, fit_forecast, compute_target_count, hot_task_imbalance, parse_service_map
+
+def test_fit_forecast_extrapolates_trend_for_each_series():
+    """A single fit should extrapolate each column's linear trend."""
+    t = np.arange(60, dtype=float)
+    y = np.column_stack([10 + 0.5 * t, 50 - 0.1 * t])
+    forecast = fit_forecast(y, horizon_steps=5)
+
+    assert forecast.shape == (5, 2)
+    assert forecast[-1, 0] == pytest.approx(10 + 0.5 * 64)
+    assert forecast[-1, 1] == pytest.approx(50 - 0.1 * 64)
+
+def test_fit_forecast_captures_seasonality():
+    """With a full season of history, the forecast should follow the cycle, not the mean."""
+    t = np.arange(120, dtype=float)
+    y = (40 + 20 * np.sin(2 * np.pi * t / 60))[:, None]
+    forecast = fit_forecast(y, horizon_steps=15, season_steps=60)
+
+    expected = 40 + 20 * np.sin(2 * np.pi * np.arange(120, 135) / 60)
+    assert np.allclose(forecast[:, 0], expected, atol=1e-6)
+
+def test_fit_forecast_ignores_missing_history():
+    """Series that started recently should be fitted only on their observed samples."""
+    t = np.arange(100, dtype=float)
+    y = np.column_stack([2.0 * t, np.where(t < 40, np.nan, 2.0 * t)])
+    forecast = fit_forecast(y, horizon_steps=1)
+
+    assert forecast[0].tolist() == pytest.approx([200.0, 200.0])
+
+def test_compute_target_count():
+    """Target count should spread forecast total CPU under the per-task target, bounded by max."""
+    assert compute_target_count(2, peak_total_cpu_percent=150, target_cpu_percent=60, max_count=10) == 3
+    assert compute_target_count(2, peak_total_cpu_percent=80, target_cpu_percent=60, max_count=10) == 2
+    assert compute_target_count(4, peak_total_cpu_percent=900, target_cpu_percent=60, max_count=10) == 10
+
+def test_hot_task_imbalance():
+    """Imbalance is max over mean per task, never below 1, and neutral without data."""
+    assert hot_task_imbalance(100, 80, 2) == pytest.approx(1.6)
+    assert hot_task_imbalance(100, 40, 2) == 1.0
+    assert hot_task_imbalance(100, float("nan"), float("nan")) == 1.0
+
+def test_parse_service_map():
+    assert parse_service_map("frontend=frontend-app-dev, cart") == {"frontend": "frontend-app-dev", "cart": "cart"}
+
+def run_forecaster(series, desired_count):
+    """Runs one cycle against {query-prefix: {step: value}} history ending at the forecaster's clock."""
+    now = 1_000_020.0
+    forecaster = Forecaster(services={"frontend": "frontend-app-dev"}, clock=lambda: now)
+    end = (now // forecaster.step) * forecaster.step
+
+    def fake_query(query, start, end_, step):
+        for prefix, values in series.items():
+            if query.startswith(prefix):
+                timestamps = end - step * np.arange(len(values))[::-1]
+                return [{"metric": {"job": "frontend"}, "values": list(zip(timestamps, values))}]
+        return []
+
+    with patch("src.forecaster.query_range", side_effect=fake_query), \
+         patch("src.forecaster.get_desired_count", return_value=desired_count), \
+         patch("src.forecaster.update_desired_count", return_value=True) as update:
+        scaled = forecaster.run_once()
+        again = forecaster.run_once()
+    return forecaster, scaled, again, update
+
+def test_forecaster_prescales_rising_cpu():
+    """Rising total CPU should trigger a scale-up before it crosses the alert threshold, once per cooldown."""
+    forecaster, scaled, again, update = run_forecaster({"sum": np.linspace(40, 110, 60)}, desired_count=2)
+
+    assert scaled == {"frontend": 3}
+    update.assert_called_once_with(forecaster.cluster, "frontend-app-dev", 3)
+    assert again == {}  # Cooldown
+
+def test_forecaster_ignores_scale_event_in_lookback():
+    """A 2 -> 3 task scale-up inside the window must not distort the total-load forecast."""
+    total = np.linspace(40, 135, 181)
+    tasks = np.where(np.arange(181) < 170, 2.0, 3.0)
+    _, scaled, _, update = run_forecaster({"sum": total, "max": total / tasks, "count": tasks}, desired_count=3)
+
+    assert scaled == {}
+    update.assert_not_called()
+
+def test_forecaster_accounts_for_hot_task():
+    """HighCPUUsage fires per instance, so an imbalanced service needs more tasks than its total implies."""
+    flat = np.full(60, 100.0)
+    _, balanced, _, _ = run_forecaster({"sum": flat, "max": flat / 2, "count": np.full(60, 2.0)}, desired_count=2)
+    _, hot, _, _ = run_forecaster({"sum": flat, "max": np.full(60, 80.0), "count": np.full(60, 2.0)}, desired_count=2)
+
+    assert balanced == {}
+    assert hot == {"frontend": 3}
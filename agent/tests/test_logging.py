@@ -0,0 +1,84 @@
+import json
+import logging
+import pytest
+from src.logging_config import JsonFormatter, SamplingFilter, ContextFilter, NonBlockingQueueHandler, correlation_scope, get_correlation_id
+
+def make_record(msg, *args, level=logging.INFO, **extra):
+    record = logging.LogRecord("src.test", level, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+def test_json_formatter_includes_extra_fields():
+    """Formatter should emit one JSON object with the formatted message and extra fields."""
+    record = make_record("Decision: %s", "restart_service", action="restart_service", confidence=0.9)
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "Decision: restart_service"
+    assert payload["action"] == "restart_service"
+    assert payload["confidence"] == 0.9
+    assert payload["level"] == "INFO"
+
+def test_json_formatter_truncates_large_payloads():
+    """Large alert payloads should be truncated rather than written in full."""
+    record = make_record("Webhook: received alert", alert={"alerts": ["x" * 10000]})
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert len(payload["alert"]) < 2100
+    assert "truncated" in payload["alert"]
+
+def test_correlation_id_attached_inside_scope():
+    """Records created inside a correlation scope should carry its id."""
+    record = make_record("hello")
+    with correlation_scope("alert-123") as correlation_id:
+        assert get_correlation_id() == "alert-123"
+        ContextFilter().filter(record)
+    assert correlation_id == "alert-123"
+    assert record.correlation_id == "alert-123"
+    assert get_correlation_id() is None
+
+def test_sampling_filter_drops_repeats_and_reports_suppressed():
+    """Identical messages beyond the burst should be dropped until the window resets."""
+    now = [0.0]
+    sampler = SamplingFilter(burst=2, window_seconds=10, clock=lambda: now[0])
+
+    results = [sampler.filter(make_record("Log group %s not found.", "/ecs/x")) for _ in range(5)]
+    assert results == [True, True, False, False, False]
+    assert sampler.filter(make_record("Log group %s not found.", "/ecs/other"))
+
+    now[0] = 11
+    record = make_record("Log group %s not found.", "/ecs/x")
+    assert sampler.filter(record)
+    assert record.suppressed == 3
+
+def test_sampling_filter_keeps_every_alert_trail():
+    """Identical lines from different alerts (correlation ids) and warnings are never sampled."""
+    sampler = SamplingFilter(burst=1, window_seconds=10, clock=lambda: 0.0)
+
+    assert all(sampler.filter(make_record("Webhook: received alert", correlation_id=f"alert-{i}")) for i in range(30))
+    assert all(sampler.filter(make_record("CloudWatch unavailable", level=logging.WARNING)) for _ in range(30))
+
+def test_sampling_filter_reports_suppressed_keys_that_never_return(caplog):
+    """Suppressed counts should be summarized once the window expires, even if the key doesn't recur."""
+    now = [0.0]
+    sampler = SamplingFilter(burst=1, window_seconds=10, clock=lambda: now[0])
+    for _ in range(4):
+        sampler.filter(make_record("Polling %s", "q-1"))
+
+    now[0] = 11
+    with caplog.at_level(logging.WARNING, logger="src.logging_config"):
+        sampler.filter(make_record("something else"))
+    assert "suppressed 3 repeats of 'Polling %s'" in caplog.text
+
+def test_queue_handler_counts_dropped_records():
+    """A full queue should drop records and count them on /metrics."""
+    import queue
+    from prometheus_client import REGISTRY
+
+    before = REGISTRY.get_sample_value("agent_log_records_dropped_total") or 0
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    handler.enqueue(make_record("first"))
+    handler.enqueue(make_record("second"))
+
+    assert handler.dropped == 1
+    assert REGISTRY.get_sample_value("agent_log_records_dropped_total") == before + 1
@@ -56,3 +56,43 @@ def test_verification_node_success():
     
     assert "execution_result" in result
     assert "Success" in result["execution_result"]
+
+def test_analyst_node_uses_insights_summary():
+    """Analyst node should count errors from pre-aggregated Insights rows."""
+    from unittest.mock import patch
+
+    rows = [
+        {"message": "ERROR TypeError: cart is undefined", "count": 120},
+        {"message": "ERROR Exception: timeout", "count": 5},
+    ]
+    with patch("src.graph.nodes.choose_query_mode", return_value="insights"), \
+         patch("src.graph.nodes.query_error_summary", return_value=rows):
+        result = analyst_node(MOCK_STATE)
+
+    assert result["log_summary"] == rows
+    assert "Found 125 error logs" in result["analysis"]
+    assert "TypeError" in result["analysis"]
+
+def test_remediation_scale_up_builds_on_current_count():
+    """Reactive scale-up must add to the live desired count, never scale below it."""
+    from unittest.mock import patch
+
+    state = {"plan": {"action": "scale_up", "reasoning": "High CPU", "confidence": 0.8}}
+    with patch("src.graph.nodes.get_desired_count", return_value=4), \
+         patch("src.graph.nodes.update_desired_count", return_value=True) as update:
+        result = remediation_node(state)
+
+    assert update.call_args.args[2] >= 5
+    assert "Success" in result["execution_result"]
+
+def test_remediation_scale_up_escalates_without_count():
+    """If the current count can't be read, escalate instead of guessing a target."""
+    from unittest.mock import patch
+
+    state = {"plan": {"action": "scale_up", "reasoning": "High CPU", "confidence": 0.8}}
+    with patch("src.graph.nodes.get_desired_count", return_value=None), \
+         patch("src.graph.nodes.update_desired_count") as update:
+        result = remediation_node(state)
+
+    update.assert_not_called()
+    assert result["execution_result"].startswith("Escalated")
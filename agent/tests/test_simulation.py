@@ -0,0 +1,53 @@
+import os
+import pytest
+from src.simulation.runner import Simulator, load_scenario
+from src.tools import cloudwatch_client, ecs_client
+
+SCENARIO_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'chaos', 'simulations')
+
+def test_container_crash_recovers_after_restart():
+    """Simulated crash-loop should be fixed by a restart and converge back to desired count."""
+    simulator = Simulator(load_scenario(os.path.join(SCENARIO_DIR, "container-crash.yaml")), seed=1)
+    report = simulator.run(20)
+
+    assert report["incidents"] == 20
+    assert report["recovery_rate"] == 1.0
+    assert report["actions"] == {"restart_service": 20}
+    assert report["mttr_seconds"]["mean"] > 0
+
+def test_bad_deploy_opens_revert_pr():
+    """Bad deploy scenario should drive the revert path through the fake GitHub API."""
+    simulator = Simulator(load_scenario(os.path.join(SCENARIO_DIR, "bad-deploy.yaml")), seed=1)
+    report = simulator.run(5)
+
+    assert report["actions"] == {"revert_commit": 5}
+    assert len(simulator.incident.github.pulls) == 1
+
+def test_simulator_does_not_leak_query_modes():
+    """Log bursts in a run must not switch later runs (or the real agent) to Insights."""
+    Simulator(load_scenario(os.path.join(SCENARIO_DIR, "bad-deploy.yaml")), seed=1).run(3)
+
+    assert cloudwatch_client._high_volume_groups == {}
+
+def test_simulator_restores_real_clients():
+    """Fakes must only be patched in for the duration of a run."""
+    original_cw, original_ecs = cloudwatch_client.get_cw_client, ecs_client.get_ecs_client
+    Simulator(load_scenario(os.path.join(SCENARIO_DIR, "cloudwatch-outage.yaml"))).run(3)
+
+    assert cloudwatch_client.get_cw_client is original_cw
+    assert ecs_client.get_ecs_client is original_ecs
+    assert "ECS_SERVICE" not in os.environ
+
+def test_crash_loop_without_remediation_never_settles():
+    """Fake ECS should not converge while a service is crash-looping."""
+    from src.simulation.fakes import SimClock, FaultInjector, FakeECS
+    import random
+
+    clock = SimClock()
+    ecs = FakeECS(clock, FaultInjector(random.Random(0)))
+    ecs.add_service("frontend", desired_count=2, task_start_seconds=10)
+    ecs.stop_task("frontend", count=1, crash_loop=True)
+    assert ecs.settle("frontend") is None
+
+    ecs.update_service(cluster="c", service="frontend", forceNewDeployment=True)
+    assert ecs.settle("frontend") == 10
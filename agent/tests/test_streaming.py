@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from src.graph.graph import create_graph
+from src.streaming import JobRegistry, run_job, format_sse
+
+INITIAL_STATE = {
+    "alert": {
+        "alert_name": "TestAlert",
+        "service": "frontend-test",
+        "severity": "critical",
+        "details": {}
+    }
+}
+
+async def collect_job_events(last_event_id=None):
+    loop = asyncio.get_running_loop()
+    job = JobRegistry().create(loop)
+    results = []
+    worker = loop.run_in_executor(None, run_job, create_graph(), job, INITIAL_STATE, results.append)
+    events = [event async for event in job.subscribe()]
+    await worker
+    replayed = [event async for event in job.subscribe(last_event_id)] if last_event_id is not None else None
+    return job, events, results, replayed
+
+def test_job_streams_each_stage_in_order():
+    """A job should publish one event per graph node, bracketed by accepted/complete."""
+    job, events, results, _ = asyncio.run(collect_job_events())
+
+    assert [e["event"] for e in events] == [
+        "accepted", "analysis_ready", "audit_ready", "plan_chosen",
+        "remediation_issued", "verification_status", "complete",
+    ]
+    assert events[3]["data"]["plan"]["action"] == "restart_service"
+    assert len(results) == 1
+    assert set(results[0]["node_results"]) == {"remediation", "verification"}
+    assert job.done
+
+def test_subscribe_resumes_after_last_event_id():
+    """Reconnecting clients should only receive events after Last-Event-ID."""
+    _, events, _, replayed = asyncio.run(collect_job_events(last_event_id=4))
+
+    assert [e["id"] for e in replayed] == [5, 6]
+
+def test_job_completes_when_result_callback_fails():
+    """A failing on_result callback must not leave subscribers waiting for a terminal event."""
+    def broken_callback(state):
+        raise RuntimeError("outcome store unavailable")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        job = JobRegistry().create(loop)
+        worker = loop.run_in_executor(None, run_job, create_graph(), job, INITIAL_STATE, broken_callback)
+        events = await asyncio.wait_for(_collect(job), timeout=10)
+        await worker
+        return events
+
+    events = asyncio.run(run())
+    assert events[-1]["event"] == "complete"
+
+async def _collect(job):
+    return [event async for event in job.subscribe()]
+
+def test_format_sse():
+    """Events should be framed per the SSE wire format."""
+    frame = format_sse({"id": 3, "event": "plan_chosen", "data": {"action": "scale_up"}})
+    assert frame == 'id: 3\nevent: plan_chosen\ndata: {"action": "scale_up"}\n\n'
+
+def test_registry_evicts_oldest_jobs():
+    """Registry should keep at most max_jobs jobs."""
+    async def create_jobs():
+        registry = JobRegistry(max_jobs=2)
+        loop = asyncio.get_running_loop()
+        first = registry.create(loop)
+        registry.create(loop)
+        registry.create(loop)
+        return registry, first
+
+    registry, first = asyncio.run(create_jobs())
+    assert registry.get(first.job_id) is None
@@ -1,6 +1,15 @@
 import pytest
 from unittest.mock import patch, MagicMock
 
+@pytest.fixture(autouse=True)
+def reset_query_modes():
+    """Log-group query modes are module state; keep each test independent."""
+    from src.tools import cloudwatch_client
+
+    cloudwatch_client.reset_query_modes()
+    yield
+    cloudwatch_client.reset_query_modes()
+
 # Test CloudWatch Client
 def test_filter_log_events_handles_missing_log_group():
     """CloudWatch client should gracefully handle missing log groups."""
@@ -38,3 +47,211 @@ def test_get_recent_commits_mock_fallback():
     os.environ["GITHUB_TOKEN"] = original_token
     
     assert isinstance(result, list)
+
+# Test Circuit Breaker / Rate Limiter
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_circuit_breaker_opens_and_recovers():
+    """Breaker should open on high error rate, fail fast, then close after a successful probe."""
+    from src.tools.resilience import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_rate_threshold=0.5, min_calls=4, window_seconds=60, open_seconds=30, clock=clock)
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 31
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # Only one probe at a time
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+def test_circuit_breaker_window_expires_old_failures():
+    """Failures older than the rolling window should not count toward the error rate."""
+    from src.tools.resilience import CircuitBreaker, CLOSED
+
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_rate_threshold=0.5, min_calls=3, window_seconds=10, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now = 20
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+def test_token_bucket_limits_burst():
+    """Token bucket should allow a burst up to capacity, then refill over time."""
+    from src.tools.resilience import TokenBucket
+
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=clock, sleep=lambda s: None)
+    assert bucket.acquire()
+    assert bucket.acquire()
+    assert not bucket.acquire()
+    clock.now = 1.0
+    assert bucket.acquire()
+
+def test_guarded_fails_fast_when_open():
+    """A guarded tool should return its fallback without calling the dependency once the circuit is open."""
+    from src.tools import resilience
+
+    resilience.reset()
+    calls = []
+
+    @resilience.guarded("flaky", fallback=lambda e: "fallback")
+    def flaky():
+        calls.append(1)
+        raise ConnectionError("down")
+
+    for _ in range(5):
+        assert flaky() == "fallback"
+    assert resilience.get_breaker("flaky").state == resilience.OPEN
+
+    calls.clear()
+    assert flaky() == "fallback"
+    assert calls == []
+    resilience.reset()
+
+# Test Logs Insights mode
+def test_query_error_summary_parses_aggregated_rows():
+    """Insights mode should poll until complete and fold per-minute buckets into one row per message."""
+    from src.tools import cloudwatch_client, resilience
+
+    resilience.reset()
+    client = MagicMock()
+    client.start_query.return_value = {"queryId": "q-1"}
+
+    def bucket(minute, message, count):
+        return [{"field": "minute", "value": minute}, {"field": "@message", "value": message}, {"field": "count", "value": count}]
+
+    client.get_query_results.side_effect = [
+        {"status": "Running", "results": []},
+        {"status": "Complete", "results": [
+            bucket("2024-01-01 12:01:00.000", "ERROR TypeError: x is undefined", "30"),
+            bucket("2024-01-01 12:00:00.000", "ERROR TypeError: x is undefined", "12"),
+            bucket("2024-01-01 12:01:00.000", "ERROR timeout", "3"),
+        ]},
+    ]
+
+    with patch.object(cloudwatch_client, "get_cw_client", return_value=client):
+        rows = cloudwatch_client.query_error_summary("/ecs/frontend", poll_interval=0)
+
+    assert rows[0]["message"] == "ERROR TypeError: x is undefined"
+    assert rows[0]["count"] == 42
+    assert rows[0]["first_seen"] == "2024-01-01 12:00:00.000"
+    assert [b["count"] for b in rows[0]["per_minute"]] == [12, 30]
+    assert rows[1]["count"] == 3
+    assert "by bin(1m) as minute, @message" in client.start_query.call_args.kwargs["queryString"]
+
+def test_build_error_summary_query_escapes_slashes():
+    """A "/" in the regex must not terminate the Insights /.../ literal."""
+    from src.tools.cloudwatch_client import build_error_summary_query
+
+    query = build_error_summary_query("GET /api/cart failed")
+    assert r"like /GET \/api\/cart failed/" in query
+    assert r"like /a\/b/" in build_error_summary_query(r"a\/b")
+
+def test_choose_query_mode_switches_after_truncated_filter():
+    """Auto mode should move a log group to Insights once filter results are truncated."""
+    from src.tools import cloudwatch_client, resilience
+
+    resilience.reset()
+    client = MagicMock()
+    client.filter_log_events.return_value = {"events": [{"message": "ERROR boom"}] * cloudwatch_client.FILTER_PAGE_LIMIT}
+
+    assert cloudwatch_client.choose_query_mode("/ecs/busy") == "filter"
+    with patch.object(cloudwatch_client, "get_cw_client", return_value=client):
+        cloudwatch_client.filter_log_events("/ecs/busy")
+    assert cloudwatch_client.choose_query_mode("/ecs/busy") == "insights"
+
+    with patch.dict("os.environ", {"LOG_QUERY_MODE": "filter"}):
+        assert cloudwatch_client.choose_query_mode("/ecs/busy") == "filter"
+
+# Test Prometheus Client
+def test_query_range_parses_matrix():
+    """Prometheus query_range results should be parsed into float (timestamp, value) pairs."""
+    from src.tools import prometheus_query, resilience
+
+    resilience.reset()
+    response = MagicMock()
+    response.json.return_value = {"status": "success", "data": {"resultType": "matrix", "result": [
+        {"metric": {"job": "frontend"}, "values": [[1700000000, "12.5"], [1700000060, "13"]]},
+    ]}}
+
+    with patch.object(prometheus_query.requests, "get", return_value=response):
+        series = prometheus_query.query_range("up", 1700000000, 1700000060, 60)
+
+    assert series == [{"metric": {"job": "frontend"}, "values": [(1700000000.0, 12.5), (1700000060.0, 13.0)]}]
+
+def test_guarded_ignores_caller_errors_for_breaker():
+    """Config errors (e.g. unknown ECS service) should return the fallback without opening the circuit."""
+    from botocore.exceptions import ClientError
+    from src.tools import resilience
+
+    resilience.reset()
+
+    @resilience.guarded("ecs-test", fallback=lambda e: False)
+    def missing_service():
+        raise ClientError({"Error": {"Code": "ServiceNotFoundException", "Message": "not found"},
+                           "ResponseMetadata": {"HTTPStatusCode": 400}}, "UpdateService")
+
+    for _ in range(10):
+        assert missing_service() is False
+    assert resilience.get_breaker("ecs-test").state == resilience.CLOSED
+    resilience.reset()
+
+def test_is_transient_classification():
+    """Throttling, 5xx and connection errors are transient; 4xx caller errors are not."""
+    import requests
+    from botocore.exceptions import ClientError
+    from src.tools.resilience import is_transient
+
+    throttled = ClientError({"Error": {"Code": "ThrottlingException"}}, "UpdateService")
+    invalid = ClientError({"Error": {"Code": "InvalidParameterException"}, "ResponseMetadata": {"HTTPStatusCode": 400}}, "UpdateService")
+    response = MagicMock(status_code=422)
+    assert is_transient(throttled)
+    assert not is_transient(invalid)
+    assert not is_transient(requests.HTTPError("422", response=response))
+    assert is_transient(requests.ConnectionError("refused"))
+    assert is_transient(TimeoutError("slow"))
+
+def test_token_bucket_rejects_zero_rate():
+    """A zero rate would divide by zero when waiting for a token."""
+    from src.tools.resilience import TokenBucket
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=5)
+
+def test_rate_limits_read_from_env_when_created():
+    """Rate limit settings should be read lazily, like the breaker settings."""
+    from src.tools import resilience
+
+    resilience.reset()
+    with patch.dict("os.environ", {"GITHUB_RATE_LIMIT": "7", "GITHUB_RATE_BURST": "3"}):
+        limiter = resilience.get_rate_limiter("github")
+    assert (limiter.rate, limiter.capacity) == (7.0, 3.0)
+    resilience.reset()
+
+def test_filter_next_token_alone_is_not_high_volume():
+    """nextToken on a short page only means the scan stopped early, not that the group is busy."""
+    from src.tools import cloudwatch_client, resilience
+
+    resilience.reset()
+    client = MagicMock()
+    client.filter_log_events.return_value = {"events": [{"message": "ERROR boom"}], "nextToken": "more"}
+
+    with patch.object(cloudwatch_client, "get_cw_client", return_value=client):
+        cloudwatch_client.filter_log_events("/ecs/quiet")
+    assert cloudwatch_client.choose_query_mode("/ecs/quiet") == "filter"
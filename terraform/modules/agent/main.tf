@@ -51,7 +51,10 @@ resource "aws_iam_role_policy" "agent_policy" {
         Action = [
           "logs:FilterLogEvents",
           "logs:DescribeLogGroups",
-          "logs:DescribeLogStreams"
+          "logs:DescribeLogStreams",
+          "logs:StartQuery",
+          "logs:GetQueryResults",
+          "logs:StopQuery"
         ]
         Resource = "*"
       },
@@ -90,7 +90,10 @@ resource "aws_iam_policy" "agent_policy" {
         Action = [
           "logs:FilterLogEvents",
           "logs:GetLogEvents",
-          "logs:DescribeLogGroups"
+          "logs:DescribeLogGroups",
+          "logs:StartQuery",
+          "logs:GetQueryResults",
+          "logs:StopQuery"
         ]
         Resource = "*" # Scope to project log groups
       },